@@ -0,0 +1,266 @@
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from bench.servers import BenchServers
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+SCENARIOS = ["crtsh", "hackertarget", "dns", "portscan", "portscan_stream", "cli"]
+
+console = Console()
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def configure(opts):
+    from core.config import Config
+    from core.logger import setup_logger
+    Config.CRTSH_URL = opts["endpoints"]["crtsh"]
+    Config.HACKERTARGET_URL = opts["endpoints"]["hackertarget"]
+    Config.DNS_NAMESERVERS = (opts["endpoints"]["dns"],)
+    Config.DNS_TIMEOUT = 2.0
+    Config.DNS_TRIES = 1
+    Config.DNS_RESOLVER_QPS = 0
+    Config.RATE_LIMIT = 1e9
+    Config.RATE_LIMITS = ()
+    Config.SCAN_PORTS = opts["port_spec"]
+    Config.SCAN_TIMEOUT = 1.0
+    # Also what cli.main() applies in the cli scenario.
+    Config.LOG_LEVEL = "ERROR"
+    setup_logger()
+
+async def bench_crtsh(opts):
+    from core.http import AsyncHTTP
+    from modules.recon.crtsh import CRTSHRecon
+
+    http, plugin = AsyncHTTP(), CRTSHRecon()
+    latencies, ops = [], 0
+    for _ in range(opts["iterations"]):
+        start = time.perf_counter()
+        ops += len([d async for d in plugin.run("bench.local", http)])
+        latencies.append(time.perf_counter() - start)
+    await http.close()
+    return ops, "domains", latencies
+
+async def bench_hackertarget(opts):
+    from core.http import AsyncHTTP
+    from modules.recon.hackertarget import HackerTargetRecon
+
+    http, plugin = AsyncHTTP(), HackerTargetRecon()
+    latencies, ops = [], 0
+    for _ in range(opts["iterations"]):
+        start = time.perf_counter()
+        ops += len((await plugin.run("bench.local", http))["data"])
+        latencies.append(time.perf_counter() - start)
+    await http.close()
+    return ops, "domains", latencies
+
+async def bench_dns(opts):
+    from core.resolver import AsyncResolver
+
+    class TimedResolver(AsyncResolver):
+        def __init__(self):
+            super().__init__()
+            self.latencies = []
+            self._sent = {}
+
+        def _submit(self, name, rtype, server):
+            fut = super()._submit(name, rtype, server)
+            self._sent[id(fut)] = time.perf_counter()
+            return fut
+
+        def _collect(self, name, rtype, fut):
+            sent = self._sent.pop(id(fut), None)
+            if sent is not None:
+                self.latencies.append(time.perf_counter() - sent)
+            return super()._collect(name, rtype, fut)
+
+    resolver = TimedResolver()
+    names = (f"h{i}.bench.local" for i in range(opts["dns_queries"]))
+    ops = 0
+    async for _, _, answers in resolver.resolve_many(names, ("A",)):
+        ops += bool(answers)
+    await resolver.close()
+    return ops, "answers", resolver.latencies
+
+async def bench_portscan(opts, engine=None):
+    from modules.recon.port_scanner import PortScanner
+
+    class TimedScanner(PortScanner):
+        def __init__(self):
+            super().__init__()
+            self.latencies = []
+            if engine:
+                self.engine = engine
+
+        def _observe(self, outcome, elapsed):
+            self.latencies.append(elapsed)
+            super()._observe(outcome, elapsed)
+
+    scanner = TimedScanner()
+    await scanner.sweep(["127.0.0.1"] * opts["iterations"])
+    return scanner.probes, "probes", scanner.latencies
+
+async def bench_portscan_stream(opts):
+    # The asyncio-streams engine, for comparison with the raw-socket default.
+    return await bench_portscan(opts, engine="stream")
+
+async def bench_cli(opts):
+    import cli
+
+    cli.console.file = open(os.devnull, "w")
+    os.chdir(tempfile.mkdtemp(prefix="recon-bench-"))
+    sys.argv = ["cli.py", "-t", "bench.local", "--no-store", "-p", opts["port_spec"], "--jsonl", "findings.jsonl"]
+
+    start = time.perf_counter()
+    await cli.main()
+    elapsed = time.perf_counter() - start
+
+    with open("findings.jsonl", encoding="utf-8") as f:
+        ops = sum(1 for _ in f)
+    return ops, "findings", [elapsed]
+
+def _child(name, opts, queue):
+    sys.path.insert(0, str(ROOT))
+    os.chdir(ROOT)
+    configure(opts)
+
+    async def measure():
+        start = time.perf_counter()
+        ops, unit, latencies = await globals()[f"bench_{name}"](opts)
+        return ops, unit, latencies, time.perf_counter() - start
+
+    ops, unit, latencies, elapsed = asyncio.run(measure())
+    queue.put({
+        "ops": ops,
+        "unit": unit,
+        "elapsed": elapsed,
+        "throughput": ops / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_rss_mb": peak_rss_mb()
+    })
+
+def run_scenario(name, opts):
+    # Each scenario runs in a fresh interpreter so peak RSS is its own.
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(name, opts, queue))
+    proc.start()
+    try:
+        result = queue.get(timeout=opts["timeout"])
+    except Exception:
+        proc.terminate()
+        result = {"error": "timeout or crash"}
+    proc.join()
+    return result
+
+def compare(current, baseline, threshold):
+    regressions = []
+    for name, res in current.items():
+        base = baseline.get(name)
+        if not base or "error" in res or "error" in base:
+            continue
+        if res["throughput"] < base["throughput"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {base['throughput']:.0f} -> {res['throughput']:.0f} {res['unit']}/s")
+        if res["p95_ms"] > base["p95_ms"] * (1 + threshold) and res["p95_ms"] - base["p95_ms"] > 1:
+            regressions.append(f"{name}: p95 {base['p95_ms']:.1f} -> {res['p95_ms']:.1f} ms")
+        if res["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold):
+            regressions.append(f"{name}: peak RSS {base['peak_rss_mb']:.0f} -> {res['peak_rss_mb']:.0f} MB")
+    return regressions
+
+def print_results(results, baseline):
+    table = Table(title="[bold red]RECON BENCHMARK[/bold red]", border_style="dim white")
+    for column in ("Scenario", "Ops", "Throughput", "p50 ms", "p95 ms", "p99 ms", "Peak RSS MB", "vs baseline"):
+        table.add_column(column, justify="right" if column != "Scenario" else "left")
+
+    for name, res in results.items():
+        if "error" in res:
+            table.add_row(name, "-", f"[red]{res['error']}[/red]", "-", "-", "-", "-", "-")
+            continue
+        base = baseline.get(name, {})
+        delta = f"{(res['throughput'] / base['throughput'] - 1) * 100:+.1f}%" if base.get("throughput") else "-"
+        table.add_row(
+            name, str(res["ops"]), f"{res['throughput']:.0f} {res['unit']}/s",
+            f"{res['p50_ms']:.1f}", f"{res['p95_ms']:.1f}", f"{res['p99_ms']:.1f}",
+            f"{res['peak_rss_mb']:.0f}", delta
+        )
+    console.print(table)
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for Recon")
+    parser.add_argument("-s", "--scenarios", default=",".join(SCENARIOS), help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--crtsh-entries", type=int, default=50000)
+    parser.add_argument("--hackertarget-lines", type=int, default=50000)
+    parser.add_argument("--dns-queries", type=int, default=20000)
+    parser.add_argument("--tcp-listeners", type=int, default=20)
+    parser.add_argument("--closed-ports", type=int, default=480, help="Refused ports added to every sweep")
+    parser.add_argument("--latency", type=float, default=0.0, help="Artificial server latency in seconds")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--baseline", default=str(BASELINES))
+    parser.add_argument("--save", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative change treated as a regression")
+    args = parser.parse_args()
+
+    servers = BenchServers(args.crtsh_entries, args.hackertarget_lines, args.latency, args.tcp_listeners)
+    endpoints = servers.start()
+
+    closed = f"40000-{40000 + args.closed_ports - 1}" if args.closed_ports else ""
+    opts = {
+        "endpoints": endpoints,
+        "port_spec": ",".join([str(p) for p in endpoints["tcp_ports"]] + ([closed] if closed else [])),
+        "dns_queries": args.dns_queries,
+        "iterations": args.iterations,
+        "timeout": args.timeout
+    }
+
+    results = {}
+    try:
+        for name in args.scenarios.split(","):
+            name = name.strip()
+            if name not in SCENARIOS:
+                console.print(f"[yellow]Unknown scenario:[/yellow] {name}")
+                continue
+            console.print(f"[dim]Running {name}...[/dim]")
+            results[name] = run_scenario(name, opts)
+    finally:
+        servers.stop()
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    print_results(results, baseline)
+
+    if args.save:
+        baseline.update(results)
+        baseline_path.write_text(json.dumps(baseline, indent=2))
+        console.print(f"[bold green][+] Baseline saved:[/bold green] {baseline_path}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        console.print(f"[bold red][!] REGRESSION[/bold red] {line}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import socket
+import struct
+import threading
+from aiohttp import web
+
+# Local stand-ins for the services the plugins talk to. Everything binds to
+# 127.0.0.1 on ephemeral ports and is started from a background thread so the
+# benchmarked code can run in separate processes.
+
+class DNSResponder(asyncio.DatagramProtocol):
+    # Minimal wire-format responder: A queries get `answer`, names starting
+    # with "nx" get NXDOMAIN, every other type gets an empty NOERROR.
+    def __init__(self, answer="127.0.0.1"):
+        self.answer = socket.inet_aton(answer)
+        self.queries = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.queries += 1
+        if len(data) < 12:
+            return
+        end = 12
+        while end < len(data) and data[end]:
+            end += data[end] + 1
+        question = data[12:end + 5]
+        if len(question) < 5:
+            return
+        qtype = struct.unpack("!H", question[-4:-2])[0]
+        first = data[13:13 + data[12]].lower()
+
+        if first.startswith(b"nx"):
+            header = data[:2] + struct.pack("!HHHHH", 0x8183, 1, 0, 0, 0)
+            self.transport.sendto(header + question, addr)
+            return
+
+        answers = 1 if qtype == 1 else 0
+        header = data[:2] + struct.pack("!HHHHH", 0x8180, 1, answers, 0, 0)
+        body = header + question
+        if answers:
+            body += struct.pack("!HHHIH", 0xC00C, 1, 1, 60, 4) + self.answer
+        self.transport.sendto(body, addr)
+
+class BenchServers:
+    def __init__(self, crtsh_entries=10000, hackertarget_lines=10000, latency=0.0, tcp_listeners=20):
+        self.crtsh_entries = crtsh_entries
+        self.hackertarget_lines = hackertarget_lines
+        self.latency = latency
+        self.tcp_listeners = tcp_listeners
+        self.endpoints = {}
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._stop = None
+
+    async def _crtsh(self, request):
+        target = request.query.get("q", "%.example.com").lstrip("%.")
+        await asyncio.sleep(self.latency)
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+
+        batch = [b"["]
+        for i in range(self.crtsh_entries):
+            host = f"h{i % max(1, self.crtsh_entries // 2)}.{target}"
+            entry = {
+                "issuer_ca_id": 183267,
+                "issuer_name": "C=US, O=Let's Encrypt, CN=R3",
+                "common_name": host,
+                "name_value": f"{host}\n*.{host}",
+                "id": 9000000000 + i,
+                "entry_timestamp": "2024-01-01T00:00:00.000",
+                "not_before": "2024-01-01T00:00:00",
+                "not_after": "2024-04-01T00:00:00",
+                "serial_number": f"{i:032x}"
+            }
+            batch.append((b"," if i else b"") + json.dumps(entry).encode())
+            if len(batch) >= 500:
+                await response.write(b"".join(batch))
+                batch = []
+        batch.append(b"]")
+        await response.write(b"".join(batch))
+        return response
+
+    async def _hackertarget(self, request):
+        target = request.query.get("q", "example.com")
+        await asyncio.sleep(self.latency)
+        lines = "\n".join(f"h{i}.{target},10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(self.hackertarget_lines))
+        return web.Response(text=lines)
+
+    async def _serve(self):
+        self._stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        app = web.Application()
+        app.router.add_get("/crtsh/", self._crtsh)
+        app.router.add_get("/hackertarget/", self._hackertarget)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        site = web.SockSite(runner, sock)
+        await site.start()
+        http_port = sock.getsockname()[1]
+
+        self.dns = DNSResponder()
+        transport, _ = await loop.create_datagram_endpoint(lambda: self.dns, local_addr=("127.0.0.1", 0))
+        dns_port = transport.get_extra_info("sockname")[1]
+
+        async def on_connect(reader, writer):
+            writer.close()
+
+        listeners = [await asyncio.start_server(on_connect, "127.0.0.1", 0) for _ in range(self.tcp_listeners)]
+
+        self.endpoints = {
+            "crtsh": f"http://127.0.0.1:{http_port}/crtsh/",
+            "hackertarget": f"http://127.0.0.1:{http_port}/hackertarget/",
+            "dns": f"127.0.0.1:{dns_port}",
+            "tcp_ports": sorted(s.sockets[0].getsockname()[1] for s in listeners)
+        }
+        self._ready.set()
+
+        await self._stop.wait()
+        for listener in listeners:
+            listener.close()
+        transport.close()
+        await runner.cleanup()
+
+    def start(self):
+        def target():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self._serve())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self.endpoints
+
+    def stop(self):
+        if self._loop and self._stop:
+            self._loop.call_soon_threadsafe(self._stop.set)
+            self._thread.join(10)
@@ -1,5 +1,6 @@
 import asyncio
 import argparse
+import os
 import sys
 import time
 from datetime import datetime
@@ -11,10 +12,21 @@ from rich.text import Text
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 
+from core.adaptive import describe as describe_limits
+from core.config import Config
+from core.cache import ResponseCache
 from core.http import AsyncHTTP
+from core.journal import Journal, journal_path
 from core.plugin_loader import PluginLoader
-from core.logger import logger
+from core.ports import parse_ports
+from core.logger import LEVELS, logger, setup_logger
+from core.metrics import metrics
+from core.pipeline import unfinished
 from core.report import ReportGenerator
+from core.sinks import JsonlSink
+from core.store import ResultStore
+from core.scheduler import Scheduler, read_targets, to_report_data
+from core.workers import WorkerPool
 
 console = Console()
 
@@ -66,7 +78,7 @@ def format_results(results):
 
     for res in results:
         if isinstance(res, Exception):
-            table.add_row("Unknown", "Error", "0", f"[red]FAILED[/red]")
+            table.add_row((getattr(res, "source", None) or "Unknown").upper(), "Error", "0", f"[red]FAILED[/red]")
             continue
         
         if not res:
@@ -83,28 +95,43 @@ def format_results(results):
         else:
             content = str(data)
 
-        table.add_row(source.upper(), dtype.upper(), content, "[green]SUCCESS[/green]")
+        status = f"[yellow]PARTIAL ({res['incomplete']})[/yellow]" if res.get("incomplete") else "[green]SUCCESS[/green]"
+        table.add_row(source.upper(), dtype.upper(), content, status)
 
     console.print(table)
 
-async def main():
-    parser = argparse.ArgumentParser(description="RedRecon Pro CLI")
-    parser.add_argument("-t", "--target", required=True, help="Target Domain")
-    args = parser.parse_args()
-
-    print_banner()
-
-    http = AsyncHTTP()
-    loader = PluginLoader()
-    plugins = loader.load_all()
-
-    if not plugins:
-        console.print("[bold red][!] CRITICAL: No modules loaded. Aborting.[/bold red]")
-        return
-
-    print_target_intel(args.target, len(plugins))
+class ResultWriter:
+    def __init__(self, store=None, diff=False):
+        self.report = ReportGenerator()
+        self.store = store
+        self.diff = diff
+
+    def write(self, target, results, started_at=None):
+        # Records the run, then renders either everything or only what changed.
+        partial = {r["source"] for r in results if isinstance(r, dict) and r.get("incomplete")}
+        if self.store:
+            run_id = self.store.record(target, results, started_at)
+            if self.diff:
+                changes = self.store.diff(target, run_id, unfinished(results))
+                return changes, self.report.generate(target, changes, partial)
+
+        data = to_report_data(results)
+        return data, self.report.generate(target, data, partial)
+
+def with_limits(description):
+    # Appends the live concurrency limits (in flight/limit per subsystem).
+    limits = describe_limits()
+    return f"{description} [dim]| {limits}[/dim]" if limits else description
+
+async def refresh(progress, task, label, every=1.0):
+    # Redraws the description so the limits stay current between findings.
+    while True:
+        await asyncio.sleep(every)
+        progress.update(task, description=with_limits(label()))
+
+async def run_single(target, scheduler, http, writer, sink=None, journal=None):
+    print_target_intel(target, len(scheduler.plugins))
 
-    results = []
     start_time = time.time()
 
     with Progress(
@@ -116,36 +143,340 @@ async def main():
         transient=True
     ) as progress:
 
-        task = progress.add_task("[cyan]Initializing Async Engine...", total=len(plugins))
+        task = progress.add_task("[cyan]Initializing Async Engine...", total=len(scheduler.plugins))
 
         await http.start()
 
-        tasks = [plugin.run(args.target, http) for plugin in plugins]
-
-        for future in asyncio.as_completed(tasks):
-            try:
-                res = await future
-            except Exception as e:
-                res = e
-            
-            results.append(res)
-            name = res.get("source", "Unknown") if isinstance(res, dict) else "Error"
-            progress.update(task, description=f"[bold green]Harvesting:[/bold green] {name}")
+        findings = 0
+        current = None
+
+        def label():
+            if current is None:
+                return "[cyan]Initializing Async Engine..."
+            return f"[bold green]Harvesting:[/bold green] {current} [dim]({findings} findings)[/dim]"
+
+        def on_item(target, plugin, item):
+            nonlocal findings, current
+            findings += 1
+            if sink:
+                sink.write(target, plugin, item)
+            if findings % 50 == 1:
+                current = plugin.source or plugin.name
+                progress.update(task, description=with_limits(label()))
+
+        def on_result(_, res):
+            nonlocal current
+            current = res.get("source", "Unknown") if isinstance(res, dict) else "Error"
+            progress.update(task, description=with_limits(label()))
             progress.advance(task)
 
+        ticker = asyncio.ensure_future(refresh(progress, task, label))
+        try:
+            results = await scheduler.run_target(target, on_result, on_item)
+        finally:
+            ticker.cancel()
+
     await http.close()
 
+    data, report_file = writer.write(target, results, start_time)
+    if journal:
+        journal.target_done(target)
+
     print()
-    format_results(results)
+    if writer.diff:
+        format_results([{"source": k, "type": "diff", "data": v} for k, v in data.items()])
+    else:
+        format_results(results)
 
     elapsed = time.time() - start_time
     console.print(f"\n[dim]Scan finished in {elapsed:.2f}s[/dim]")
 
-    report = ReportGenerator()
-    report_file = report.generate(args.target, {r["source"]: r["data"] for r in results if isinstance(r, dict)})
-
     console.print(f"[bold green][+] Report generated:[/bold green] {report_file}")
 
+async def run_batch(targets_file, scheduler, http, writer, sink=None, journal=None):
+    print_target_intel(targets_file, len(scheduler.plugins))
+
+    start_time = time.time()
+    done = 0
+
+    with Progress(
+        SpinnerColumn(style="bold red"),
+        TextColumn("[bold white]{task.description}"),
+        console=console,
+        transient=True
+    ) as progress:
+
+        task = progress.add_task("[cyan]Initializing Async Engine...")
+
+        await http.start()
+
+        def label():
+            return f"[bold green]Targets done:[/bold green] {done}"
+
+        def on_target(target, results):
+            nonlocal done
+            done += 1
+            data, report_file = writer.write(target, results)
+            if journal:
+                journal.target_done(target)
+            assets = sum(len(v) if isinstance(v, list) else 1 for v in data.values())
+            failed = sum(1 for r in results if isinstance(r, Exception))
+            partial = sum(1 for r in results if isinstance(r, dict) and r.get("incomplete"))
+            status = f" [red]({failed} failed)[/red]" if failed else ""
+            status += f" [yellow]({partial} partial)[/yellow]" if partial else ""
+            progress.console.print(f"[bold green][+][/bold green] {target}: {assets} {'changes' if writer.diff else 'assets'}{status} -> {report_file}")
+            progress.update(task, description=with_limits(label()))
+
+        targets = read_targets(targets_file)
+        if journal and journal.finished:
+            targets = (t for t in targets if t not in journal.finished)
+
+        ticker = asyncio.ensure_future(refresh(progress, task, label))
+        try:
+            await scheduler.run_many(targets, on_target, on_item=sink.write if sink else None)
+        finally:
+            ticker.cancel()
+
+    await http.close()
+
+    elapsed = time.time() - start_time
+    console.print(f"\n[dim]Batch of {done} targets finished in {elapsed:.2f}s[/dim]")
+
+async def run_server(address, http, loader, args):
+    # aiohttp.web is only loaded in daemon mode.
+    from core.server import ScanServer
+
+    store = None if args.no_store else ResultStore(args.store)
+    server = ScanServer(http, loader, store, ReportGenerator(), {
+        "modules": args.modules,
+        "exclude": args.exclude,
+        "category": args.category
+    })
+    metrics_server = await metrics.serve(args.metrics_port) if args.metrics_port else None
+
+    await http.start()
+    await server.start(address)
+    console.print(f"[bold green][+] Serving scan jobs on[/bold green] {address} [dim](POST /jobs, GET /jobs/<id>, GET /jobs/<id>/events)[/dim]")
+    try:
+        await server.wait()
+    finally:
+        await server.close()
+        await http.close()
+        if metrics_server:
+            await metrics_server.cleanup()
+        if store:
+            store.close()
+
+def csv(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+def timeouts(value):
+    # "120" or "120,crt.sh=60,hackertarget=30" -> (default, ((source, seconds), ...))
+    default, overrides = None, []
+    for part in csv(value):
+        source, _, seconds = part.rpartition("=")
+        try:
+            seconds = float(seconds)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid timeout: {part}")
+        if seconds < 0:
+            raise argparse.ArgumentTypeError(f"negative timeout: {part}")
+        if source:
+            overrides.append((source, seconds))
+        else:
+            default = seconds
+    return default, tuple(overrides)
+
+def print_modules(loader):
+    table = Table(title="[bold red]AVAILABLE MODULES[/bold red]", border_style="dim white")
+    table.add_column("Module", style="cyan")
+    table.add_column("Category", style="magenta")
+    table.add_column("Flow", style="dim")
+    table.add_column("Description")
+
+    for entry in loader.manifest():
+        flow = f"{entry['consumes'] or 'target'} -> {entry['produces'] or '-'}"
+        table.add_row(f"{entry['name']} ({entry['module'].rsplit('.', 1)[-1]})", entry["category"], flow, entry["description"] or "")
+
+    console.print(table)
+    for error in loader.errors:
+        console.print(f"[bold yellow][!] Plugin error:[/bold yellow] {error}")
+
+async def main():
+    parser = argparse.ArgumentParser(description="RedRecon Pro CLI")
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument("-t", "--target", help="Target Domain")
+    scope.add_argument("-T", "--targets-file", help="File with one target per line ('-' reads stdin)")
+    scope.add_argument("--serve", metavar="ADDR", help="Run as a daemon taking scan jobs over HTTP on HOST:PORT or a Unix socket path")
+    parser.add_argument("--max-targets", type=int, default=Config.MAX_TARGETS, help="Targets scanned concurrently")
+    parser.add_argument("--max-tasks", type=int, default=Config.MAX_TASKS, help="Plugin runs in flight across all targets")
+    parser.add_argument("--per-target", type=int, default=Config.PER_TARGET_TASKS, help="Plugin runs in flight per target")
+    parser.add_argument("--cache", action="store_true", default=Config.CACHE_ENABLED, help="Cache HTTP responses on disk")
+    parser.add_argument("--offline", action="store_true", help="Serve passive sources from the cache only")
+    parser.add_argument("--jsonl", help="Stream findings to this JSON-lines file as they are found")
+    parser.add_argument("--report-mode", choices=["auto", "html", "json"], default=Config.REPORT_MODE, help="html: DOM tables, json: embedded data rendered client-side")
+    parser.add_argument("--report-compress", action="store_true", default=Config.REPORT_COMPRESS, help="gzip the embedded report data")
+    parser.add_argument("--store", default=Config.STORE_PATH, help="SQLite results store (one row per asset per run)")
+    parser.add_argument("--no-store", action="store_true", help="Do not record results in the store")
+    parser.add_argument("--plugin-timeout", type=timeouts, help="Seconds per plugin run (per item for pipeline stages), optionally per source: 120,crt.sh=60")
+    parser.add_argument("--target-timeout", type=float, default=Config.TARGET_TIMEOUT, help="Seconds per target; unfinished plugins report partial results")
+    parser.add_argument("--time-budget", type=float, default=Config.TIME_BUDGET, help="Seconds for the whole run; targets not started by then are skipped")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run from its checkpoint journal")
+    parser.add_argument("--diff", action="store_true", help="Report only assets that are new or gone since the previous run")
+    parser.add_argument("--metrics", help="Export run metrics at the end (.prom/.txt: Prometheus text, otherwise JSON)")
+    parser.add_argument("--metrics-port", type=int, help="Serve live metrics on 127.0.0.1:PORT (/metrics, /metrics.json)")
+    parser.add_argument("--workers", type=int, default=Config.WORKERS, help="Shard a targets file over N processes (shared HTTP rate limits)")
+    parser.add_argument("--resolvers", default=Config.DNS_RESOLVERS_FILE, help="File with one DNS resolver per line (ip or ip:port)")
+    parser.add_argument("--resolver-qps", type=float, default=Config.DNS_RESOLVER_QPS, help="Query cap per resolver (0: uncapped), split across --workers")
+    parser.add_argument("--dns-verify", choices=["none", "suspicious", "all"], default=Config.DNS_VERIFY, help="Cross-check answers with a second resolver")
+    parser.add_argument("--keep-wildcards", action="store_true", help="Do not drop names that only resolve through wildcard DNS")
+    parser.add_argument("--brute", action="store_true", help="Brute-force subdomains of the target from a wordlist (active DNS)")
+    parser.add_argument("--wordlist", default=Config.BRUTE_WORDLIST, help="Wordlist for the subdomain brute-force (streamed, any size)")
+    parser.add_argument("--brute-qps", type=float, default=Config.BRUTE_QPS, help="DNS queries per second for the brute-force, split across --workers")
+    parser.add_argument("--permutations", action="store_true", help="With --brute, also try permutations of discovered names")
+    parser.add_argument("--no-adaptive", action="store_true", help="Fixed concurrency limits instead of adapting to timeouts and latency")
+    parser.add_argument("--scan-engine", choices=["auto", "socket", "stream"], default=Config.SCAN_ENGINE, help="socket: raw non-blocking connect(); stream: asyncio streams")
+    parser.add_argument("--fingerprint", action="store_true", help="Grab banners and fingerprint open ports over the scan's connections")
+    parser.add_argument("-p", "--ports", default=Config.SCAN_PORTS, help="Port spec: 1-1024,8080 / top-100 / top-1000 / web / db / remote / all")
+    parser.add_argument("--modules", type=csv, help="Only load these plugins (class, name, file or source, comma separated)")
+    parser.add_argument("--exclude", type=csv, help="Skip these plugins or categories (comma separated)")
+    parser.add_argument("--category", type=csv, help="Only load plugins from these categories (comma separated)")
+    parser.add_argument("--log-level", type=str.upper, choices=LEVELS, default=Config.LOG_LEVEL, help="Minimum level written to the terminal and the JSON log")
+    parser.add_argument("--log-json", default=Config.LOG_JSON, help="Also write logs as JSON lines to this file ('-' for stderr)")
+    parser.add_argument("--list-modules", action="store_true", help="List the available plugins and exit")
+    args = parser.parse_args()
+
+    if args.list_modules:
+        print_modules(PluginLoader())
+        return
+    if not (args.target or args.targets_file or args.serve):
+        parser.error("one of the arguments -t/--target -T/--targets-file --serve is required")
+    if args.serve and "/" not in args.serve and not args.serve.rpartition(":")[2].isdigit():
+        parser.error("--serve: expected HOST:PORT, PORT or a Unix socket path")
+    if args.serve and (args.workers > 1 or args.resume):
+        parser.error("--serve runs jobs in-process; --workers and --resume do not apply")
+
+    try:
+        parse_ports(args.ports)
+    except ValueError as e:
+        parser.error(f"--ports: {e}")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and not args.targets_file:
+        parser.error("--workers needs -T/--targets-file")
+    if args.resolvers:
+        # The resolver pool (and its DNS stack) only loads when --resolvers is given.
+        from core.resolver_pool import load_resolvers
+        try:
+            if not load_resolvers(args.resolvers):
+                parser.error(f"--resolvers: no resolvers in {args.resolvers}")
+        except OSError as e:
+            parser.error(f"--resolvers: {e}")
+    if args.resolver_qps < 0:
+        parser.error("--resolver-qps must not be negative")
+    if args.brute_qps <= 0:
+        parser.error("--brute-qps must be positive")
+    if args.permutations and not args.brute:
+        parser.error("--permutations needs --brute")
+    if args.wordlist and not os.path.isfile(args.wordlist):
+        parser.error(f"--wordlist: {args.wordlist} not found")
+    if args.target_timeout < 0 or args.time_budget < 0:
+        parser.error("--target-timeout and --time-budget must not be negative")
+    if args.diff and args.no_store:
+        parser.error("--diff needs the results store")
+    if args.plugin_timeout:
+        default, overrides = args.plugin_timeout
+        if default is not None:
+            Config.PLUGIN_TIMEOUT = default
+        Config.PLUGIN_TIMEOUTS = overrides + Config.PLUGIN_TIMEOUTS
+    Config.TARGET_TIMEOUT = args.target_timeout
+    Config.TIME_BUDGET = args.time_budget
+    Config.SCAN_PORTS = args.ports
+    Config.SCAN_ENGINE = args.scan_engine
+    Config.ADAPTIVE_CONCURRENCY = not args.no_adaptive
+    Config.FINGERPRINT = args.fingerprint
+    if not args.fingerprint:
+        args.exclude = (args.exclude or []) + ["fingerprint"]
+    Config.BRUTE = args.brute
+    if not args.brute:
+        args.exclude = (args.exclude or []) + ["bruteforce"]
+    Config.WILDCARD_FILTER = not args.keep_wildcards
+    Config.DNS_RESOLVERS_FILE = args.resolvers
+    Config.DNS_RESOLVER_QPS = args.resolver_qps
+    Config.DNS_VERIFY = args.dns_verify
+    Config.BRUTE_WORDLIST = args.wordlist
+    Config.BRUTE_QPS = args.brute_qps
+    Config.BRUTE_PERMUTATIONS = args.permutations
+    Config.OFFLINE = args.offline
+    Config.REPORT_MODE = args.report_mode
+    Config.REPORT_COMPRESS = args.report_compress
+    Config.LOG_LEVEL = args.log_level
+    Config.LOG_JSON = args.log_json
+    try:
+        setup_logger()
+    except OSError as e:
+        parser.error(f"--log-json: {e}")
+
+    print_banner()
+
+    http = AsyncHTTP(cache=ResponseCache() if args.cache or args.offline else None)
+    loader = PluginLoader()
+    plugins = loader.load(args.modules, args.exclude, args.category)
+
+    for error in loader.errors:
+        console.print(f"[bold yellow][!] Plugin error:[/bold yellow] {error}")
+    if not plugins:
+        console.print("[bold red][!] CRITICAL: No modules loaded. Aborting.[/bold red]")
+        return
+
+    if args.serve:
+        await run_server(args.serve, http, loader, args)
+        return
+
+    spec = args.target or (args.targets_file if args.targets_file == "-" else os.path.abspath(args.targets_file))
+    journal = Journal(journal_path(spec, [p.source or p.name for p in plugins]), resume=args.resume)
+    if args.resume:
+        console.print(f"[bold yellow][*] Resuming from:[/bold yellow] {journal.path}")
+
+    if args.workers > 1:
+        scheduler = WorkerPool(args.workers, plugins, {
+            "modules": args.modules,
+            "exclude": args.exclude,
+            "category": args.category,
+            "cache": args.cache or args.offline,
+            "max_targets": args.max_targets,
+            "max_tasks": args.max_tasks,
+            "per_target": args.per_target
+        })
+    else:
+        scheduler = Scheduler(plugins, http, args.max_targets, args.max_tasks, args.per_target, journal)
+
+    sink = JsonlSink(args.jsonl) if args.jsonl else None
+    store = None if args.no_store else ResultStore(args.store)
+    writer = ResultWriter(store, args.diff)
+    metrics_server = await metrics.serve(args.metrics_port) if args.metrics_port else None
+
+    completed = False
+    try:
+        if args.targets_file:
+            await run_batch(args.targets_file, scheduler, http, writer, sink, journal)
+        else:
+            await run_single(args.target, scheduler, http, writer, sink, journal)
+        completed = True
+    finally:
+        journal.close(complete=completed)
+        if not completed:
+            console.print(f"[bold yellow][!] Progress saved to {journal.path}; rerun with --resume to continue[/bold yellow]")
+        if metrics_server:
+            await metrics_server.cleanup()
+        if args.metrics:
+            console.print(f"[bold green][+] Metrics exported:[/bold green] {metrics.export(args.metrics)}")
+        if store:
+            store.close()
+        if sink:
+            sink.close()
+            console.print(f"[bold green][+] {sink.count} findings streamed to:[/bold green] {sink.path}")
+
 if __name__ == "__main__":
     if sys.platform == "win32":
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -0,0 +1,121 @@
+import asyncio
+from collections import deque
+from core.config import Config
+from core.metrics import metrics
+
+CONGESTION = ("timeout", "overload")
+# How far a floor moves toward a higher reading per window.
+DRIFT = 0.5
+
+_limits = {}
+
+def describe():
+    # "HTTP 18/24 · DNS 120/350 · TCP 300/300" (in flight / limit), for the progress UI.
+    return " · ".join(f"{name.upper()} {limit.inflight}/{int(limit.limit)}" for name, limit in _limits.items())
+
+# AIMD concurrency limit: a semaphore whose size follows the signals of the
+# operations it admits. Each window of completions either adds `step` slots
+# or, when timeouts or latency rise above what this subsystem has shown so
+# far, cuts the limit by ADAPTIVE_BACKOFF. Both floors drift up toward what
+# is observed, so a target that is simply slow or heavily filtered stops
+# counting as congestion after a few windows.
+class AdaptiveLimit:
+    def __init__(self, name, maximum, minimum=1, initial=None, step=1, adaptive=None):
+        self.name = name
+        self.maximum = max(1, int(maximum))
+        self.minimum = max(1, min(int(minimum), self.maximum))
+        self.adaptive = Config.ADAPTIVE_CONCURRENCY if adaptive is None else adaptive
+        start = initial if self.adaptive and initial else self.maximum
+        self.limit = float(min(max(start, self.minimum), self.maximum))
+        self.step = step
+        self.inflight = 0
+        self._waiters = deque()
+        self._reset_window()
+        self._base_latency = None
+        self._base_timeouts = None
+        _limits[name] = self
+        metrics.set("recon_concurrency_limit", int(self.limit), subsystem=name)
+
+    def _reset_window(self):
+        self._samples = 0
+        self._timeouts = 0
+        self._latency = 0.0
+        self._timed = 0
+
+    def try_acquire(self) -> bool:
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            return True
+        return False
+
+    async def acquire(self):
+        if self.try_acquire():
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancel.
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        self.inflight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.inflight < int(self.limit):
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self.inflight += 1
+                fut.set_result(None)
+
+    def record(self, outcome, latency=None):
+        # "ok" (with its latency), "timeout"/"overload" (congestion); anything
+        # else (refused, protocol errors...) says nothing about load.
+        if not self.adaptive:
+            return
+        if outcome == "ok":
+            if latency is not None:
+                self._latency += latency
+                self._timed += 1
+        elif outcome in CONGESTION:
+            self._timeouts += 1
+        else:
+            return
+        self._samples += 1
+        if self._samples >= max(Config.ADAPTIVE_WINDOW, int(self.limit)):
+            self._adjust()
+
+    @staticmethod
+    def _floor(base, value):
+        if base is None or value < base:
+            return value
+        return base + (value - base) * DRIFT
+
+    def _adjust(self):
+        ratio = self._timeouts / self._samples
+        latency = self._latency / self._timed if self._timed else None
+        congested = False
+        if self._base_timeouts is not None and ratio > self._base_timeouts + Config.ADAPTIVE_TIMEOUT_MARGIN:
+            congested = True
+        if latency is not None and self._base_latency is not None:
+            excess = latency - self._base_latency
+            if latency > self._base_latency * Config.ADAPTIVE_LATENCY_TOLERANCE and excess > Config.ADAPTIVE_LATENCY_SLACK:
+                congested = True
+
+        self._base_timeouts = self._floor(self._base_timeouts, ratio)
+        if latency is not None:
+            self._base_latency = self._floor(self._base_latency, latency)
+
+        if congested:
+            self.limit = max(self.minimum, self.limit * Config.ADAPTIVE_BACKOFF)
+            metrics.inc("recon_concurrency_backoffs_total", subsystem=self.name)
+        elif self.inflight >= int(self.limit) - self.step:
+            # Only grow a limit that is actually being used.
+            self.limit = min(self.maximum, self.limit + self.step)
+            self._wake()
+        metrics.set("recon_concurrency_limit", int(self.limit), subsystem=self.name)
+        self._reset_window()
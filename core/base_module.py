@@ -1,6 +1,27 @@
 from abc import ABC, abstractmethod
 
+class Incomplete(Exception):
+    # Raised by a plugin (typically an async generator) that lost part of its
+    # input, e.g. a truncated download: what it already yielded is kept and
+    # the result is marked incomplete with this reason.
+    def __init__(self, reason="error"):
+        super().__init__(reason)
+        self.reason = reason
+
 class BaseModule(ABC):
+    # Pipeline contract: a module with `consumes` set is fed every item of that
+    # data type as upstream modules emit it; whatever it returns is published
+    # under `produces`. Modules without `consumes` run once against the target.
+    # Both run() and process() may be async generators that yield findings one
+    # at a time instead of returning them all at the end.
+    # The loader reads name/description/category (and these class attributes)
+    # from the source without importing it, so keep them literal constants.
+    consumes = None
+    produces = None
+    source = None
+    # Higher runs first when plugins compete for scheduler slots.
+    priority = 0
+
     def __init__(self):
         self.name = "BaseModule"
         self.description = "Abstract Base Class"
@@ -8,4 +29,7 @@ class BaseModule(ABC):
 
     @abstractmethod
     async def run(self, target: str, http_client) -> dict:
-        pass
\ No newline at end of file
+        pass
+
+    async def process(self, item, target: str, http_client) -> list:
+        return []
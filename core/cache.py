@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+from core.config import Config
+from core.logger import logger
+from core.metrics import metrics
+
+@dataclass
+class CacheEntry:
+    key: str
+    body: bytes
+    content_type: str
+    etag: str
+    last_modified: str
+    expires_at: float
+
+    @property
+    def fresh(self):
+        return time.time() < self.expires_at
+
+    def validators(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+# SQLite-backed response cache. Queries run in a worker thread so large
+# bodies never block the event loop; eviction is LRU by last access.
+class ResponseCache:
+    def __init__(self, path=None, max_mb=None, default_ttl=None, ttls=None):
+        self.path = Path(path or Config.CACHE_PATH)
+        self.max_bytes = (max_mb or Config.CACHE_MAX_MB) * 1024 * 1024
+        self.default_ttl = default_ttl or Config.CACHE_TTL
+        self.ttls = dict(ttls if ttls is not None else Config.CACHE_TTLS)
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);
+        """)
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(method, url, params=None):
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        return hashlib.sha256(f"{method.upper()} {url}?{query}".encode()).hexdigest()
+
+    def ttl_for(self, url):
+        host = (urlsplit(url).hostname or "").lower()
+        for suffix, ttl in self.ttls.items():
+            if host == suffix or host.endswith("." + suffix):
+                return ttl
+        return self.default_ttl
+
+    def _lookup(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT key, body, content_type, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row:
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+        return CacheEntry(*row) if row else None
+
+    def _store(self, key, url, body, content_type, etag, last_modified, ttl):
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, body, content_type, etag, last_modified, now, now + ttl, now, len(body))
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._db.commit()
+
+    def _refresh(self, key, ttl):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                (now + ttl, now, key)
+            )
+            self._db.commit()
+
+    def _evict(self):
+        while self._size > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                if self._size <= self.max_bytes:
+                    break
+
+    async def lookup(self, method, url, params=None):
+        entry = await asyncio.to_thread(self._lookup, self.make_key(method, url, params))
+        if entry:
+            self.hits += 1
+        else:
+            self.misses += 1
+        metrics.inc("recon_cache_requests_total", result="hit" if entry else "miss")
+        return entry
+
+    async def store(self, method, url, params, body, content_type="", etag="", last_modified=""):
+        key = self.make_key(method, url, params)
+        await asyncio.to_thread(
+            self._store, key, url, body, content_type, etag, last_modified, self.ttl_for(url)
+        )
+
+    async def refresh(self, entry, url):
+        await asyncio.to_thread(self._refresh, entry.key, self.ttl_for(url))
+
+    @staticmethod
+    def decode(body, content_type):
+        text = body.decode("utf-8", "replace")
+        if "json" in (content_type or ""):
+            try:
+                return json.loads(text)
+            except ValueError:
+                pass
+        return text
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+        logger.debug(f"[Cache] hits={self.hits} misses={self.misses}")
@@ -13,3 +13,139 @@ class Config:
         "AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/122.0.0.0 Safari/537.36"
     )
+
+    # Passive sources
+    CRTSH_URL: str = os.getenv("RECON_CRTSH_URL", "https://crt.sh/")
+    HACKERTARGET_URL: str = os.getenv("RECON_HACKERTARGET_URL", "https://api.hackertarget.com/hostsearch/")
+
+    # Batch scheduler
+    MAX_TARGETS: int = 20
+    MAX_TASKS: int = 100
+    PER_TARGET_TASKS: int = 4
+
+    # Deadlines, in seconds (0: none). PLUGIN_TIMEOUT bounds a root plugin's
+    # whole run and each item a stage processes; PLUGIN_TIMEOUTS overrides it
+    # per source or plugin name. TIME_BUDGET bounds the whole run.
+    PLUGIN_TIMEOUT: float = 0
+    PLUGIN_TIMEOUTS: tuple = ()
+    TARGET_TIMEOUT: float = 0
+    TIME_BUDGET: float = 0
+    PLUGIN_PRIORITIES: tuple = ()
+
+    # DNS engine
+    DNS_NAMESERVERS: tuple = ("1.1.1.1", "8.8.8.8")
+    DNS_TIMEOUT: float = 5.0
+    DNS_TRIES: int = 2
+    DNS_CONCURRENCY: int = 1000
+    DNS_RESOLVERS_FILE: str = os.getenv("RECON_RESOLVERS", "")
+    DNS_RESOLVER_QPS: float = 500.0
+    DNS_LATENCY_TARGET: float = 0.25
+    DNS_MIN_HEALTH: float = 0.5
+    DNS_MIN_SAMPLES: int = 20
+    DNS_BENCH_SECONDS: float = 60.0
+    DNS_VERIFY: str = "suspicious"
+    WILDCARD_FILTER: bool = True
+    WILDCARD_PROBES: int = 3
+
+    # Subdomain brute-force (--brute, --permutations)
+    BRUTE: bool = False
+    BRUTE_WORDLIST: str = os.getenv("RECON_WORDLIST", "")
+    BRUTE_QPS: float = 500.0
+    BRUTE_PERMUTATIONS: bool = False
+    PERMUTATION_WORDS: tuple = (
+        "dev", "test", "stage", "staging", "prod", "qa", "uat", "api", "admin",
+        "internal", "int", "beta", "old", "new", "v1", "v2", "backup", "demo"
+    )
+
+    # Pipeline
+    STAGE_WORKERS: int = 50
+
+    # Adaptive concurrency (AIMD). HTTP requests, DNS queries and TCP probes
+    # each start at `initial` in flight, add `step` per window without
+    # congestion and back off on excess timeouts/latency, between `min` and
+    # CONCURRENCY / DNS_CONCURRENCY / SCAN_CONCURRENCY.
+    ADAPTIVE_CONCURRENCY: bool = True
+    ADAPTIVE_WINDOW: int = 32
+    ADAPTIVE_BACKOFF: float = 0.75
+    ADAPTIVE_LATENCY_TOLERANCE: float = 2.0
+    ADAPTIVE_LATENCY_SLACK: float = 0.05
+    ADAPTIVE_TIMEOUT_MARGIN: float = 0.05
+    HTTP_ADAPTIVE: tuple = (4, 20, 2)  # (min, initial, step)
+    DNS_ADAPTIVE: tuple = (50, 200, 25)
+    SCAN_ADAPTIVE: tuple = (50, 250, 50)
+
+    # Port scanner
+    SCAN_PORTS: str = "default"
+    SCAN_TIMEOUT: float = 1.5
+    SCAN_CONCURRENCY: int = 1000
+    SCAN_ENGINE: str = "auto"
+
+    # Service fingerprinting (reuses the scan's open sockets)
+    FINGERPRINT: bool = False
+    FP_CONCURRENCY: int = 200
+    FP_TIMEOUT: float = 3.0
+    FP_BANNER_WAIT: float = 0.5
+    FP_PARK_SECONDS: float = 10.0
+
+    # HTTP response cache
+    CACHE_ENABLED: bool = os.getenv("RECON_CACHE", "0") == "1"
+    CACHE_PATH: str = os.getenv("RECON_CACHE_PATH", ".cache/http.sqlite")
+    CACHE_TTL: int = 3600
+    CACHE_TTLS: tuple = (
+        ("crt.sh", 86400),
+        ("api.hackertarget.com", 86400),
+    )
+    CACHE_MAX_MB: int = 512
+    OFFLINE: bool = False
+    CACHE_STREAM_MAX_MB: int = 64
+
+    # HTTP host policy
+    RATE_LIMIT: float = 10.0
+    RATE_LIMITS: tuple = (
+        ("crt.sh", 1.0),
+        ("api.hackertarget.com", 1.0),
+    )
+    RATE_BURST: int = 5
+    RETRIES: int = 3
+    BACKOFF_BASE: float = 1.0
+    BACKOFF_MAX: float = 30.0
+    RETRY_STATUSES: tuple = (429, 500, 502, 503, 504)
+    BREAKER_THRESHOLD: int = 5
+    BREAKER_COOLDOWN: float = 60.0
+
+    # Reports
+    REPORT_MODE: str = "auto"
+    REPORT_DOM_LIMIT: int = 5000
+    REPORT_COMPRESS: bool = False
+
+    # Results store
+    STORE_PATH: str = os.getenv("RECON_STORE_PATH", "results/recon.sqlite")
+    STORE_BATCH: int = 1000
+
+    # Daemon mode (--serve)
+    SERVE_JOBS: int = 4
+    SERVE_KEEP: int = 1000
+
+    # Checkpoint journal (--resume)
+    JOURNAL_DIR: str = os.getenv("RECON_JOURNAL_DIR", "results/journal")
+    JOURNAL_FLUSH: int = 500
+    JOURNAL_FLUSH_SECONDS: float = 2.0
+
+    # Logging: records are handed to a background thread through a queue;
+    # each call site logs at most LOG_BURST records per LOG_WINDOW seconds
+    # below ERROR (the rest are counted and reported as "+N").
+    LOG_LEVEL: str = os.getenv("RECON_LOG_LEVEL", "INFO").upper()
+    LOG_JSON: str = os.getenv("RECON_LOG_JSON", "")
+    LOG_QUEUE: bool = True
+    LOG_BURST: int = 20
+    LOG_WINDOW: float = 1.0
+
+    # Plugin loader
+    PLUGIN_MANIFEST: str = ".cache/plugins.json"
+
+    # Worker processes (batch mode)
+    WORKERS: int = 1
+    WORKER_FLUSH: int = 500
+
+    # Domain scope (empty: bundled public suffix list)
+    PSL_PATH: str = os.getenv("RECON_PSL", "")
@@ -0,0 +1,200 @@
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from pathlib import Path
+from core.config import Config
+
+PSL_PATH = Path(__file__).parent / "data" / "public_suffix_list.dat"
+HOSTNAME = re.compile(r"^[a-z0-9_](?:[a-z0-9_-]*[a-z0-9_])?(?:\.[a-z0-9_](?:[a-z0-9_-]*[a-z0-9_])?)*$")
+
+def normalize(name):
+    # Lowercases and strips wildcards/trailing dots; None for anything that is
+    # not a hostname (crt.sh name_value also carries e-mails and junk).
+    name = name.strip().lower().rstrip(".")
+    while name.startswith("*."):
+        name = name[2:]
+    if not name or len(name) > 253 or not HOSTNAME.match(name):
+        return None
+    return name
+
+def in_scope(name, scope):
+    # Label-aligned suffix match: a.example.com is in example.com, notexample.com is not.
+    return name == scope or name.endswith("." + scope)
+
+class PublicSuffixList:
+    def __init__(self, path=None):
+        self.rules, self.wildcards, self.exceptions = set(), set(), set()
+        with open(path or Config.PSL_PATH or PSL_PATH, encoding="utf-8") as handle:
+            for line in handle:
+                rule = line.strip()
+                if not rule or rule.startswith("//"):
+                    continue
+                for form in self._forms(rule.split()[0]):
+                    if form.startswith("!"):
+                        self.exceptions.add(form[1:])
+                    elif form.startswith("*."):
+                        self.wildcards.add(form[2:])
+                    else:
+                        self.rules.add(form)
+
+    @staticmethod
+    def _forms(rule):
+        # Names arrive in punycode; keep the Unicode rule and its xn-- form.
+        yield rule
+        if not rule.isascii():
+            try:
+                yield rule.encode("idna").decode("ascii")
+            except UnicodeError:
+                pass
+
+    def suffix(self, name):
+        # Longest matching rule wins; exceptions beat wildcards; "*" is the default.
+        labels = name.split(".")
+        for i in range(len(labels)):
+            candidate = ".".join(labels[i:])
+            if candidate in self.exceptions:
+                return ".".join(labels[i + 1:])
+            if candidate in self.rules:
+                return candidate
+            if i + 1 < len(labels) and ".".join(labels[i + 1:]) in self.wildcards:
+                return candidate
+        return labels[-1]
+
+    def registrable(self, name):
+        # eTLD+1 (example.co.uk for a.b.example.co.uk); None for a bare suffix.
+        suffix = self.suffix(name)
+        if name == suffix:
+            return None
+        head = name[:-len(suffix) - 1]
+        return f"{head.rsplit('.', 1)[-1]}.{suffix}"
+
+_psl = None
+
+def public_suffixes() -> PublicSuffixList:
+    global _psl
+    if _psl is None:
+        _psl = PublicSuffixList()
+    return _psl
+
+def _reverse(name):
+    return ".".join(reversed(name.split("."))).encode()
+
+def _restore(key):
+    return ".".join(reversed(bytes(key).decode().split(".")))
+
+class _Keys:
+    # Sequence view over the packed entries, for bisect.
+    def __init__(self, domains):
+        self.domains = domains
+
+    def __len__(self):
+        return len(self.domains._offsets) - 1
+
+    def __getitem__(self, i):
+        return self.domains._key(i)
+
+# Set of hostnames stored as reversed labels (com.example.api) in one sorted,
+# newline-separated buffer plus a uint32 offset array: a flattened label trie
+# where every zone is a contiguous range. New names land in a plain set that
+# is merged into the buffer once it outgrows `compact_every` and a quarter of
+# the buffer, so small scopes cost what a set costs and large ones a few bytes
+# over the name length instead of a str object and a hash slot per name.
+class DomainSet:
+    BLOCK = 64
+
+    def __init__(self, names=(), compact_every=65536):
+        self.compact_every = compact_every
+        self._blob = bytearray()
+        self._offsets = array("I", [0])
+        self._index = []
+        self._recent = set()
+        self._limit = compact_every
+        self.update(names)
+
+    def _key(self, i):
+        return self._blob[self._offsets[i]:self._offsets[i + 1] - 1]
+
+    def _packed(self, lo=0, hi=None):
+        offsets, blob = self._offsets, self._blob
+        hi = len(offsets) - 1 if hi is None else hi
+        for i in range(lo, hi):
+            yield bytes(blob[offsets[i]:offsets[i + 1] - 1])
+
+    def _find(self, key):
+        # Sparse index of every BLOCK-th key picks the block; one substring
+        # search over that block's bytes settles membership.
+        block = bisect_right(self._index, key) - 1
+        if block < 0:
+            return False
+        if self._index[block] == key:
+            return True
+        lo = block * self.BLOCK
+        hi = min(lo + self.BLOCK, len(self._offsets) - 1)
+        return self._blob.find(b"\n" + key + b"\n", self._offsets[lo], self._offsets[hi]) >= 0
+
+    def _rebuild(self, keys):
+        # `keys` must be sorted and unique.
+        self._blob = bytearray(b"\n".join(keys))
+        if keys:
+            self._blob += b"\n"
+        self._offsets = array("I", accumulate((len(k) + 1 for k in keys), initial=0))
+        self._index = keys[::self.BLOCK]
+        self._limit = max(self.compact_every, len(keys) // 4)
+
+    def _keys(self):
+        return bytes(self._blob).split(b"\n")[:-1]
+
+    def _compact(self):
+        # The packed keys and the sorted new ones are two runs; sort() merges them in linear time.
+        keys = self._keys()
+        keys.extend(sorted(self._recent))
+        keys.sort()
+        self._rebuild(keys)
+        self._recent = set()
+
+    def add(self, name) -> bool:
+        key = ".".join(reversed(name.split("."))).encode()
+        if key in self._recent or self._find(key):
+            return False
+        self._recent.add(key)
+        if len(self._recent) >= self._limit:
+            self._compact()
+        return True
+
+    def update(self, names) -> int:
+        before = len(self)
+        if isinstance(names, DomainSet):
+            # Bulk merge in C instead of re-adding names one by one.
+            self._rebuild(sorted(set(self._keys()).union(self._recent, names._keys(), names._recent)))
+            self._recent = set()
+        else:
+            for name in names:
+                self.add(name)
+        return len(self) - before
+
+    def __contains__(self, name):
+        key = _reverse(name)
+        return key in self._recent or self._find(key)
+
+    def __len__(self):
+        return len(self._offsets) - 1 + len(self._recent)
+
+    def __iter__(self):
+        # Zone order: every name of a zone comes out next to its siblings.
+        for key in heapq.merge(self._packed(), sorted(self._recent)):
+            yield _restore(key)
+
+    def under(self, zone):
+        # Names equal to or below `zone`, straight from the packed range.
+        key = _reverse(zone)
+        prefix = key + b"."
+        keys = _Keys(self)
+        lo = bisect_left(keys, key)
+        hi = bisect_left(keys, key + b"/")
+        packed = self._packed(lo, hi)
+        recent = sorted(k for k in self._recent if k == key or k.startswith(prefix))
+        for found in heapq.merge(packed, recent):
+            if found == key or found.startswith(prefix):
+                yield _restore(found)
@@ -0,0 +1,203 @@
+import asyncio
+import re
+import socket
+import ssl
+import struct
+from core.config import Config
+from core.logger import logger
+
+TLS_PORTS = {443, 465, 636, 853, 989, 990, 992, 993, 994, 995, 2376, 4443, 5061, 5986, 6443, 8443, 9443}
+HTTP_PORTS = {80, 81, 3000, 5000, 8000, 8008, 8080, 8081, 8088, 8888, 9000, 9090}
+BANNERS = (
+    (b"SSH-", "ssh"),
+    (b"220", "ftp/smtp"),
+    (b"+OK", "pop3"),
+    (b"* OK", "imap"),
+    (b"RFB ", "vnc"),
+    (b"-ERR", "redis"),
+)
+LINGER_RST = struct.pack("ii", 1, 0)
+PRINTABLE = re.compile(rb"[^\x20-\x7e]+")
+
+def clean(data, limit=120):
+    return PRINTABLE.sub(b" ", data).decode("ascii").strip()[:limit]
+
+def classify(banner):
+    for prefix, service in BANNERS:
+        if banner.startswith(prefix):
+            return service, clean(banner.split(b"\r\n", 1)[0].split(b"\n", 1)[0])
+    # MySQL greets with a length-prefixed handshake: protocol 10, then the version.
+    if len(banner) > 5 and banner[4] == 10:
+        return "mysql", clean(banner[5:].split(b"\0", 1)[0])
+    return "banner", clean(banner.split(b"\n", 1)[0])
+
+# Minimal DER walk over the certificate: subject CN and SAN dNSNames, enough
+# to fingerprint without pulling in an ASN.1 dependency.
+def _tlv(data, pos):
+    tag, length = data[pos], data[pos + 1]
+    pos += 2
+    if length & 0x80:
+        size = length & 0x7F
+        length = int.from_bytes(data[pos:pos + size], "big")
+        pos += size
+    return tag, pos, pos + length
+
+def _children(data, start, end):
+    while start < end:
+        tag, body, nxt = _tlv(data, start)
+        yield tag, body, nxt
+        start = nxt
+
+def _common_name(data, start, end):
+    for _, rdn, rdn_end in _children(data, start, end):
+        for _, attr, attr_end in _children(data, rdn, rdn_end):
+            _, oid, oid_end = _tlv(data, attr)
+            if data[oid:oid_end] == b"\x55\x04\x03":
+                _, value, value_end = _tlv(data, oid_end)
+                return data[value:value_end].decode("utf-8", "replace")
+    return None
+
+def cert_names(der):
+    try:
+        _, cert, cert_end = _tlv(der, 0)
+        _, tbs, tbs_end = _tlv(der, cert)
+        fields = list(_children(der, tbs, tbs_end))
+        if fields and fields[0][0] == 0xA0:
+            fields = fields[1:]
+        # serial, signature, issuer, validity, subject, spki, [extensions]
+        _, subject, subject_end = fields[4]
+        cn = _common_name(der, subject, subject_end)
+
+        sans = []
+        for tag, body, end in fields[6:]:
+            if tag != 0xA3:
+                continue
+            _, exts, exts_end = _tlv(der, body)
+            for _, ext, ext_end in _children(der, exts, exts_end):
+                parts = list(_children(der, ext, ext_end))
+                if der[parts[0][1]:parts[0][2]] != b"\x55\x1d\x11":
+                    continue
+                _, octets, _ = parts[-1]
+                _, names, names_end = _tlv(der, octets)
+                for name_tag, name, name_end in _children(der, names, names_end):
+                    if name_tag == 0x82:
+                        sans.append(der[name:name_end].decode("ascii", "replace"))
+        return cn, sans
+    except (IndexError, ValueError):
+        return None, []
+
+# Open sockets left by the port scanner, keyed by (host, port), so the
+# fingerprint stage talks over the scan's own connection. Unclaimed sockets
+# are reset after FP_PARK_SECONDS.
+class ConnectionPark:
+    def __init__(self, ttl=None):
+        self.ttl = ttl or Config.FP_PARK_SECONDS
+        self.loop = asyncio.get_running_loop()
+        self.sockets = {}
+
+    def put(self, host, port, sock):
+        key = (host, port)
+        old = self.sockets.pop(key, None)
+        if old is not None:
+            self._reset(old)
+        self.sockets[key] = sock
+        self.loop.call_later(self.ttl, self._expire, key, sock)
+
+    def claim(self, host, port):
+        return self.sockets.pop((host, port), None)
+
+    def _expire(self, key, sock):
+        if self.sockets.get(key) is sock:
+            del self.sockets[key]
+            self._reset(sock)
+
+    @staticmethod
+    def _reset(sock):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RST)
+        except OSError:
+            pass
+        sock.close()
+
+_parks = {}
+
+def get_park() -> ConnectionPark:
+    loop = asyncio.get_running_loop()
+    park = _parks.get(loop)
+    if park is None:
+        _parks.clear()
+        park = _parks[loop] = ConnectionPark()
+    return park
+
+def _tls_context():
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+_TLS = None
+
+async def _head(reader, writer, host):
+    writer.write(f"HEAD / HTTP/1.0\r\nHost: {host}\r\nUser-Agent: {Config.USER_AGENT}\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.read(2048)
+    if not head.startswith(b"HTTP/"):
+        return None
+    lines = head.split(b"\r\n")
+    status = clean(lines[0].split(b" ", 1)[-1], 40)
+    server = next((clean(l.split(b":", 1)[1], 60) for l in lines[1:] if l.lower().startswith(b"server:")), "")
+    return " ".join(p for p in (status, server) if p)
+
+async def fingerprint(host, port, sock=None, name=None):
+    # One probe per port over `sock` (or a new connection): a passive banner
+    # read, then TLS (cert CN/SANs) on TLS ports, then HTTP HEAD. Returns
+    # (service, detail); the caller bounds the whole thing with a deadline.
+    global _TLS
+    loop = asyncio.get_running_loop()
+    if sock is None:
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            await loop.sock_connect(sock, (host, port))
+        except OSError:
+            sock.close()
+            return None
+
+    writer = None
+    try:
+        if port not in TLS_PORTS and port not in HTTP_PORTS:
+            try:
+                banner = await asyncio.wait_for(loop.sock_recv(sock, 1024), Config.FP_BANNER_WAIT)
+            except asyncio.TimeoutError:
+                banner = b""
+            if banner:
+                return classify(banner)
+
+        if port in TLS_PORTS:
+            if _TLS is None:
+                _TLS = _tls_context()
+            reader, writer = await asyncio.open_connection(sock=sock, ssl=_TLS, server_hostname=name or host)
+            ssl_object = writer.get_extra_info("ssl_object")
+            cn, sans = cert_names(ssl_object.getpeercert(binary_form=True) or b"")
+            parts = [ssl_object.version() or "tls"]
+            if cn:
+                parts.append(f"CN={cn}")
+            if sans:
+                parts.append(f"SAN={','.join(sans[:5])}{'...' if len(sans) > 5 else ''}")
+            http = await _head(reader, writer, name or host)
+            return ("https" if http else "tls"), " ".join(parts + ([http] if http else []))
+
+        reader, writer = await asyncio.open_connection(sock=sock)
+        http = await _head(reader, writer, name or host)
+        if http:
+            return "http", http
+        return None
+    except (OSError, ssl.SSLError, asyncio.IncompleteReadError) as e:
+        logger.debug("[Fingerprint] %s:%s: %r", host, port, e)
+        return None
+    finally:
+        if writer is not None:
+            writer.transport.abort()
+        else:
+            ConnectionPark._reset(sock)
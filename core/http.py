@@ -1,11 +1,149 @@
 import aiohttp
 import asyncio
+import multiprocessing
+import random
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from core.adaptive import AdaptiveLimit
 from core.logger import logger
 from core.config import Config
+from core.cache import ResponseCache
+from core.metrics import metrics
+
+class CircuitOpen(Exception):
+    pass
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+# Token buckets kept in shared memory so worker processes draw from one budget
+# per host. Hosts hash into a fixed table; a collision only makes two hosts
+# share a (stricter) bucket. Each slot is (tokens, updated, paused_until).
+class SharedLimits:
+    SLOTS = 256
+
+    def __init__(self, ctx=None):
+        ctx = ctx or multiprocessing.get_context()
+        self._state = ctx.Array("d", self.SLOTS * 3, lock=False)
+        self._lock = ctx.Lock()
+
+    def bucket(self, host: str, rate: float, burst: int):
+        return SharedTokenBucket(self, zlib.crc32(host.encode()) % self.SLOTS, rate, burst)
+
+    def take(self, slot: int, rate: float, capacity: int) -> float:
+        # Takes a token if one is available, otherwise returns how long to wait.
+        i = slot * 3
+        state = self._state
+        with self._lock:
+            now = time.monotonic()
+            if state[i + 2] > now:
+                return state[i + 2] - now
+            tokens = capacity if not state[i + 1] else min(capacity, state[i] + (now - state[i + 1]) * rate)
+            state[i + 1] = now
+            if tokens >= 1:
+                state[i] = tokens - 1
+                return 0.0
+            state[i] = tokens
+            return (1 - tokens) / rate
+
+    def pause(self, slot: int, seconds: float):
+        i = slot * 3
+        with self._lock:
+            self._state[i + 2] = max(self._state[i + 2], time.monotonic() + seconds)
+
+class SharedTokenBucket:
+    def __init__(self, limits: SharedLimits, slot: int, rate: float, burst: int):
+        self.limits = limits
+        self.slot = slot
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while (wait := self.limits.take(self.slot, self.rate, self.capacity)) > 0:
+                await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        self.limits.pause(self.slot, seconds)
+
+class CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None and time.monotonic() - self.opened_at < self.cooldown
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def failure(self):
+        self.failures += 1
+        # After the cooldown a single failed probe (half-open) reopens the circuit.
+        if self.failures >= self.threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+class HostPolicy:
+    def __init__(self, host: str, shared: SharedLimits = None):
+        self.host = host
+        limits = dict(Config.RATE_LIMITS)
+        rate = next((r for h, r in limits.items() if host == h or host.endswith("." + h)), Config.RATE_LIMIT)
+        self.bucket = shared.bucket(host, rate, Config.RATE_BURST) if shared else TokenBucket(rate, Config.RATE_BURST)
+        self.breaker = CircuitBreaker(Config.BREAKER_THRESHOLD, Config.BREAKER_COOLDOWN)
+
+def backoff_delay(attempt: int) -> float:
+    return random.uniform(0, min(Config.BACKOFF_MAX, Config.BACKOFF_BASE * 2 ** attempt))
+
+def retry_after(response) -> float:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
 
 class AsyncHTTP:
-    def __init__(self):
+    def __init__(self, cache: ResponseCache = None, limits: SharedLimits = None):
         self.session = None
+        self.cache = cache
+        self.limits = limits
+        self.policies = {}
+        # In-flight requests across all hosts; the connector limit is its ceiling.
+        self.concurrency = AdaptiveLimit("http", Config.CONCURRENCY, *Config.HTTP_ADAPTIVE)
 
     async def start(self):
         timeout = aiohttp.ClientTimeout(total=Config.TIMEOUT)
@@ -16,19 +154,171 @@ class AsyncHTTP:
             headers={"User-Agent": Config.USER_AGENT}
         )
 
+    def policy(self, url: str) -> HostPolicy:
+        host = (urlsplit(url).hostname or "").lower()
+        if host not in self.policies:
+            self.policies[host] = HostPolicy(host, self.limits)
+        return self.policies[host]
+
+    async def _open(self, url, params, kwargs):
+        # Sends the request under the host's rate limit, retrying 429/5xx and
+        # timeouts with jittered exponential backoff. The caller owns the response.
+        policy = self.policy(url)
+
+        for attempt in range(Config.RETRIES + 1):
+            if policy.breaker.is_open:
+                metrics.inc("recon_http_errors_total", host=policy.host, kind="circuit_open")
+                raise CircuitOpen(f"circuito aberto para {policy.host}")
+
+            await policy.bucket.acquire()
+            last = attempt == Config.RETRIES
+            if attempt:
+                metrics.inc("recon_http_retries_total", host=policy.host)
+            await self.concurrency.acquire()
+            started = time.perf_counter()
+            try:
+                response = await self.session.get(url, params=params, **kwargs)
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                self.concurrency.release()
+                kind = "timeout" if isinstance(e, asyncio.TimeoutError) else "connection"
+                self.concurrency.record(kind)
+                metrics.inc("recon_http_errors_total", host=policy.host, kind=kind)
+                policy.breaker.failure()
+                if last:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.debug("Retry %d em %s após %.1fs: %r", attempt + 1, url, delay, e)
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self.concurrency.release()
+                raise
+
+            self.concurrency.release()
+            elapsed = time.perf_counter() - started
+            self.concurrency.record("overload" if response.status in (429, 503) else "ok", elapsed)
+            metrics.observe("recon_http_request_seconds", elapsed, host=policy.host)
+            metrics.inc("recon_http_requests_total", host=policy.host, status=response.status)
+
+            if response.status not in Config.RETRY_STATUSES:
+                policy.breaker.success()
+                return response
+
+            policy.breaker.failure()
+            wait = retry_after(response)
+            if last or (wait is not None and wait > Config.BACKOFF_MAX):
+                logger.warning(f"[yellow]HTTP {response.status}[/yellow] em {url} (desistindo)")
+                return response
+
+            response.release()
+            if wait is not None:
+                policy.bucket.pause(wait)
+            delay = wait if wait is not None else backoff_delay(attempt)
+            logger.debug("HTTP %d em %s, retry %d em %.1fs", response.status, url, attempt + 1, delay)
+            await asyncio.sleep(delay)
+
+    async def _from_cache(self, url, params, kwargs):
+        # Returns (entry, body); body is set when the cache can answer without the network.
+        if not self.cache:
+            return None, None
+        entry = await self.cache.lookup("GET", url, params)
+        if entry and (entry.fresh or Config.OFFLINE):
+            return entry, entry.body
+        if Config.OFFLINE:
+            logger.debug("Offline, sem cache para %s", url)
+            return None, b""
+        if entry:
+            kwargs["headers"] = {**kwargs.get("headers", {}), **entry.validators()}
+        return entry, None
+
+    async def _store(self, url, params, response, body):
+        await self.cache.store(
+            "GET", url, params, body,
+            response.content_type,
+            response.headers.get("ETag", ""),
+            response.headers.get("Last-Modified", "")
+        )
+
     async def get(self, url: str, params: dict = None, **kwargs):
+        entry, cached = await self._from_cache(url, params, kwargs)
+        if cached is not None:
+            return self.cache.decode(cached, entry.content_type) if entry else None
+
         if not self.session: await self.start()
         try:
-            async with self.session.get(url, params=params, **kwargs) as response:
+            async with await self._open(url, params, kwargs) as response:
+                if response.status == 304 and entry:
+                    await self.cache.refresh(entry, url)
+                    return self.cache.decode(entry.body, entry.content_type)
                 if response.status in [401, 403]:
                     logger.warning(f"[yellow]Auth Error:[/yellow] {url}")
+                body = await response.read()
+                metrics.inc("recon_http_bytes_total", len(body), host=response.url.host)
+                if self.cache and response.status == 200:
+                    await self._store(url, params, response, body)
+                    return self.cache.decode(body, response.content_type)
                 try:
                     return await response.json()
                 except:
                     return await response.text()
+        except CircuitOpen as e:
+            logger.warning(f"[yellow]{e}[/yellow], ignorando {url}")
+            if entry:
+                return self.cache.decode(entry.body, entry.content_type)
+            return None
         except Exception as e:
-            logger.debug(f"Falha em {url}: {e}")
+            logger.warning(f"Falha em {url}: {e!r}")
+            if entry:
+                return self.cache.decode(entry.body, entry.content_type)
             return None
 
+    async def stream(self, url: str, params: dict = None, chunk_size: int = 65536, **kwargs):
+        # Yields the response body in chunks. Bodies up to CACHE_STREAM_MAX_MB are
+        # also written to the cache; larger ones are streamed through untouched.
+        entry, cached = await self._from_cache(url, params, kwargs)
+        if cached is not None:
+            for i in range(0, len(cached), chunk_size):
+                yield cached[i:i + chunk_size]
+            return
+
+        if not self.session: await self.start()
+        sent = False
+        try:
+            async with await self._open(url, params, kwargs) as response:
+                if response.status == 304 and entry:
+                    await self.cache.refresh(entry, url)
+                    for i in range(0, len(entry.body), chunk_size):
+                        yield entry.body[i:i + chunk_size]
+                    return
+                if response.status in [401, 403]:
+                    logger.warning(f"[yellow]Auth Error:[/yellow] {url}")
+
+                keep = [] if self.cache and response.status == 200 else None
+                limit, kept = Config.CACHE_STREAM_MAX_MB * 1024 * 1024, 0
+                host = response.url.host
+
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    metrics.inc("recon_http_bytes_total", len(chunk), host=host)
+                    if keep is not None:
+                        kept += len(chunk)
+                        if kept <= limit:
+                            keep.append(chunk)
+                        else:
+                            keep = None
+                    sent = True
+                    yield chunk
+
+                if keep is not None:
+                    await self._store(url, params, response, b"".join(keep))
+        except Exception as e:
+            logger.warning(f"Falha em {url}: {e!r}")
+            # A stale cached copy beats nothing, but only before any of the live
+            # body went out; otherwise the consumer has to know it is truncated.
+            if sent or not entry:
+                raise
+            for i in range(0, len(entry.body), chunk_size):
+                yield entry.body[i:i + chunk_size]
+
     async def close(self):
-        if self.session: await self.session.close()
\ No newline at end of file
+        if self.session: await self.session.close()
+        if self.cache: self.cache.close()
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from core.config import Config
+from core.logger import logger
+
+def journal_path(spec, sources):
+    # One journal per run identity: the same target (or targets file) with the
+    # same plugin selection resumes from the same file.
+    key = json.dumps([spec, sorted(sources)])
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return Path(Config.JOURNAL_DIR) / f"{digest}.jsonl"
+
+# Work a plugin already did for one target before the crash.
+class PluginState:
+    __slots__ = ("found", "inputs", "done", "res")
+
+    def __init__(self):
+        self.found = []
+        self.inputs = set()
+        self.done = False
+        self.res = None
+
+# Append-only progress journal, one JSON record per line:
+#   {"t": target, "p": source, "f": item}   finding
+#   {"t": target, "p": source, "i": item}   stage input fully processed
+#   {"t": target, "p": source, "d": res}    root plugin finished (res: its result dict,
+#                                           with "data": null when the data is the findings)
+#   {"t": target, "end": 1}                 target finished and reported
+# Records are buffered and flushed every JOURNAL_FLUSH records or
+# JOURNAL_FLUSH_SECONDS, so a crash loses at most one batch. A torn last line
+# is skipped on replay.
+class Journal:
+    def __init__(self, path, resume=False, flush_every=None, flush_seconds=None):
+        self.path = Path(path)
+        self.flush_every = flush_every or Config.JOURNAL_FLUSH
+        self.flush_seconds = flush_seconds or Config.JOURNAL_FLUSH_SECONDS
+        self.finished = set()
+        self.states = {}
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if resume and self.path.exists():
+            self._replay()
+            logger.info(f"[Journal] Retomando de {self.path}: {len(self.finished)} alvos concluídos, {len(self.states)} parciais")
+        self.handle = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+    def _replay(self):
+        with open(self.path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                target = rec.get("t")
+                if "end" in rec:
+                    # Finished targets only need to be skipped; drop their state.
+                    self.finished.add(target)
+                    self.states.pop(target, None)
+                    continue
+                state = self.states.setdefault(target, {}).setdefault(rec.get("p"), PluginState())
+                if "f" in rec:
+                    state.found.append(rec["f"])
+                elif "i" in rec:
+                    state.inputs.add(rec["i"])
+                elif "d" in rec:
+                    state.done = True
+                    state.res = rec["d"]
+
+    def state(self, target):
+        return self.states.get(target, {})
+
+    def _append(self, rec):
+        self.buffer.append(json.dumps(rec, default=str))
+        if len(self.buffer) >= self.flush_every or time.monotonic() - self.last_flush >= self.flush_seconds:
+            self.flush()
+
+    def found(self, target, source, item):
+        self._append({"t": target, "p": source, "f": item})
+
+    def processed(self, target, source, item):
+        self._append({"t": target, "p": source, "i": item})
+
+    def plugin_done(self, target, source, res=None):
+        # Keeps the dict's own source/type: a plugin may report under another
+        # label than the one it is journaled by.
+        if isinstance(res, dict) and isinstance(res.get("data"), list):
+            res = {**res, "data": None}
+        self._append({"t": target, "p": source, "d": res})
+
+    def target_done(self, target):
+        self._append({"t": target, "end": 1})
+        self.states.pop(target, None)
+        self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.handle.write("\n".join(self.buffer) + "\n")
+            self.handle.flush()
+            self.buffer.clear()
+        self.last_flush = time.monotonic()
+
+    def close(self, complete=False):
+        # A completed run has nothing left to resume.
+        self.flush()
+        self.handle.close()
+        if complete:
+            os.remove(self.path)
@@ -0,0 +1,73 @@
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+_WS = " \t\r\n"
+
+async def iter_json_array(chunks):
+    # Decodes the elements of a top-level JSON array one at a time from an
+    # async iterable of byte chunks, keeping only the undecoded tail in memory.
+    utf8 = codecs.getincrementaldecoder("utf-8")("replace")
+    buf, pos = "", 0
+    started = False
+    chunks = chunks.__aiter__()
+    exhausted = False
+
+    async def more():
+        nonlocal buf, pos, exhausted
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            exhausted = True
+            buf = buf[pos:] + utf8.decode(b"", final=True)
+            pos = 0
+            return
+        buf = buf[pos:] + utf8.decode(chunk)
+        pos = 0
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WS:
+            pos += 1
+        if pos >= len(buf):
+            if exhausted:
+                # A body cut off mid-array must not pass for a complete one.
+                raise ValueError("Truncated JSON array" if started else "Empty response")
+            await more()
+            continue
+
+        if not started:
+            if buf[pos] != "[":
+                raise ValueError("Response is not a JSON array")
+            started = True
+            pos += 1
+            continue
+
+        if buf[pos] == "]":
+            return
+        if buf[pos] == ",":
+            pos += 1
+            continue
+
+        try:
+            item, end = _decoder.raw_decode(buf, pos)
+        except ValueError:
+            if exhausted:
+                raise
+            await more()
+            continue
+
+        if not isinstance(item, (dict, list)):
+            # A scalar is only whole once a delimiter follows it: "2." or "1e"
+            # at a chunk edge decode as a shorter number or not at all.
+            after = end
+            while after < len(buf) and buf[after] in _WS:
+                after += 1
+            if after == len(buf) or buf[after] not in ",]":
+                if not exhausted:
+                    await more()
+                    continue
+                if after < len(buf):
+                    raise ValueError(f"Invalid JSON array at: {buf[after:after + 20]!r}")
+
+        pos = end
+        yield item
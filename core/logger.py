@@ -1,16 +1,145 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from rich.logging import RichHandler
 from rich.console import Console
+from rich.markup import MarkupError, render
+from core.config import Config
 
 console = Console()
 
-def setup_logger(level="INFO"):
-    logging.basicConfig(
-        level=level,
-        format="%(message)s",
-        datefmt="[%X]",
-        handlers=[RichHandler(rich_tracebacks=True, markup=True)]
-    )
-    return logging.getLogger("redrecon")
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
 
-logger = setup_logger()
\ No newline at end of file
+class _Handoff(QueueHandler):
+    # The caller only merges the args into the message; rich rendering and
+    # file/terminal writes happen on the listener thread. exc_info is kept so
+    # RichHandler can still draw the traceback.
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# Caps each call site (file:line) below ERROR at `burst` records per
+# `window` seconds. What gets dropped is counted and reported on the site's
+# next record, so a progress message fired per probe or per query turns into
+# one line a second with a "+N" tally.
+class RateLimit(logging.Filter):
+    def __init__(self, burst, window):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.sites = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR or not self.burst:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self.lock:
+            site = self.sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                dropped = site[2] if site else 0
+                self.sites[key] = [now, 1, 0]
+            elif site[1] < self.burst:
+                site[1] += 1
+                return True
+            else:
+                site[2] += 1
+                return False
+        if dropped:
+            record.msg = f"{record.getMessage()} (+{dropped} semelhantes suprimidas)"
+            record.args = None
+        return True
+
+    def leftovers(self):
+        with self.lock:
+            dropped = [(path, line, site[2]) for (path, line), site in self.sites.items() if site[2]]
+            self.sites.clear()
+        return dropped
+
+class JsonLinesFormatter(logging.Formatter):
+    # One JSON object per record, rich markup stripped, for log shippers.
+    def format(self, record):
+        message = record.getMessage()
+        try:
+            message = render(message).plain
+        except MarkupError:
+            pass
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": message,
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+_listener = None
+_limiter = None
+
+def _shutdown():
+    # Drains the queue and reports what the rate limit swallowed since the
+    # last record of each site.
+    global _listener
+    if _limiter is not None:
+        log = logging.getLogger("redrecon")
+        for path, line, count in _limiter.leftovers():
+            log.info(f"[Log] {count} mensagens suprimidas de {path.rsplit('/', 1)[-1]}:{line}")
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def setup_logger(level=None, json_path=None, queued=None):
+    # Every record goes through a queue to a listener thread that owns the
+    # real handlers (rich terminal output, optional JSON lines), so logging
+    # from the event loop costs a filter check and a queue put.
+    global _listener, _limiter
+    _shutdown()
+    level = level or Config.LOG_LEVEL
+    json_path = Config.LOG_JSON if json_path is None else json_path
+    queued = Config.LOG_QUEUE if queued is None else queued
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        if not isinstance(handler, QueueHandler):
+            handler.close()
+
+    rich = RichHandler(rich_tracebacks=True, markup=True)
+    rich.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+    handlers = [rich]
+    if json_path:
+        stream = logging.StreamHandler() if json_path == "-" else logging.FileHandler(json_path, encoding="utf-8")
+        stream.setFormatter(JsonLinesFormatter())
+        handlers.append(stream)
+
+    if queued:
+        _listener = QueueListener(queue.SimpleQueue(), *handlers, respect_handler_level=True)
+        _listener.start()
+        handlers = [_Handoff(_listener.queue)]
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+    # The rate limit sits on our own logger, so a dropped record never
+    # reaches a handler.
+    log = logging.getLogger("redrecon")
+    if _limiter is not None:
+        log.removeFilter(_limiter)
+    _limiter = RateLimit(Config.LOG_BURST, Config.LOG_WINDOW)
+    log.addFilter(_limiter)
+    return log
+
+atexit.register(_shutdown)
+
+logger = setup_logger()
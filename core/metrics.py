@@ -0,0 +1,179 @@
+import json
+import math
+import time
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        self.counts[bisect_left(self.buckets, value)] += 1
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation.
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else math.inf
+        return math.inf
+
+# Process-wide registry. Series are keyed by (name, sorted labels); recording
+# is a dict lookup plus an add, cheap enough for per-probe hooks.
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, value=1):
+        self.value += value
+
+class Metrics:
+    def __init__(self):
+        self.started = time.time()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.help = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items())) if labels else ()
+
+    def counter(self, name, **labels) -> Counter:
+        # Returns the series itself so hot paths can bind it once and call .inc().
+        key = self._key(name, labels)
+        series = self.counters.get(key)
+        if series is None:
+            series = self.counters[key] = Counter()
+        return series
+
+    def histogram(self, name, **labels) -> Histogram:
+        key = self._key(name, labels)
+        series = self.histograms.get(key)
+        if series is None:
+            series = self.histograms[key] = Histogram()
+        return series
+
+    def inc(self, name, value=1, **labels):
+        self.counter(name, **labels).inc(value)
+
+    def set(self, name, value, **labels):
+        self.gauges[self._key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        self.histogram(name, **labels).observe(value)
+
+    def reset(self):
+        self.__init__()
+
+    def snapshot(self):
+        # Raw, picklable state for shipping a worker's series to the parent.
+        return {
+            "counters": [(k, c.value) for k, c in self.counters.items()],
+            "gauges": list(self.gauges.items()),
+            "histograms": [(k, h.buckets, h.counts, h.sum, h.count) for k, h in self.histograms.items()]
+        }
+
+    def merge(self, snapshot):
+        for key, value in snapshot["counters"]:
+            self.counters.setdefault(key, Counter()).inc(value)
+        for key, value in snapshot["gauges"]:
+            self.gauges[key] = value
+        for key, buckets, counts, total, count in snapshot["histograms"]:
+            hist = self.histograms.setdefault(key, Histogram(buckets))
+            hist.counts = [a + b for a, b in zip(hist.counts, counts)]
+            hist.sum += total
+            hist.count += count
+
+    def to_dict(self):
+        def series(items, render):
+            out = {}
+            for (name, labels), value in sorted(items, key=lambda kv: (kv[0][0], kv[0][1])):
+                out.setdefault(name, []).append({"labels": dict(labels), **render(value)})
+            return out
+
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "counters": series(self.counters.items(), lambda c: {"value": c.value}),
+            "gauges": series(self.gauges.items(), lambda v: {"value": v}),
+            "histograms": series(self.histograms.items(), lambda h: {
+                "count": h.count,
+                "sum": h.sum,
+                "p50": h.quantile(0.5),
+                "p95": h.quantile(0.95),
+                "p99": h.quantile(0.99),
+                "buckets": dict(zip([str(b) for b in h.buckets] + ["+Inf"], h.counts))
+            })
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2, default=str)
+
+    def to_prometheus(self):
+        def fmt(labels, extra=None):
+            pairs = list(labels) + (extra or [])
+            if not pairs:
+                return ""
+            escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+        lines, typed = [], set()
+
+        def header(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), counter in sorted(self.counters.items(), key=lambda kv: kv[0]):
+            header(name, "counter")
+            lines.append(f"{name}{fmt(labels)} {counter.value}")
+        for (name, labels), value in sorted(self.gauges.items(), key=lambda kv: kv[0]):
+            header(name, "gauge")
+            lines.append(f"{name}{fmt(labels)} {value}")
+        for (name, labels), hist in sorted(self.histograms.items(), key=lambda kv: kv[0]):
+            header(name, "histogram")
+            cumulative = 0
+            for bound, count in zip(list(hist.buckets) + ["+Inf"], hist.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{fmt(labels, [('le', str(bound))])} {cumulative}")
+            lines.append(f"{name}_sum{fmt(labels)} {hist.sum}")
+            lines.append(f"{name}_count{fmt(labels)} {hist.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        text = self.to_prometheus() if str(path).endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    async def serve(self, port, host="127.0.0.1"):
+        from aiohttp import web
+
+        async def prometheus(_):
+            return web.Response(text=self.to_prometheus(), content_type="text/plain")
+
+        async def as_json(_):
+            return web.Response(text=self.to_json(), content_type="application/json")
+
+        app = web.Application()
+        app.router.add_get("/metrics", prometheus)
+        app.router.add_get("/metrics.json", as_json)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+metrics = Metrics()
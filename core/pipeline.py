@@ -0,0 +1,289 @@
+import asyncio
+import inspect
+import time
+from contextlib import asynccontextmanager
+from core.base_module import Incomplete
+from core.config import Config
+from core.domains import DomainSet
+from core.logger import logger
+from core.metrics import metrics
+
+SEED_TYPE = "subdomains"
+
+def new_bucket(dtype):
+    # Hostnames go in the compact suffix-indexed set; other types in a plain set.
+    return DomainSet() if dtype == SEED_TYPE else set()
+
+def _lookup(overrides, plugin, default):
+    # Overrides name a plugin by source ("hackertarget") or name ("HackerTarget").
+    labels = {label.lower() for label in (plugin.source, plugin.name) if label}
+    for source, value in overrides:
+        if source.lower() in labels:
+            return value
+    return default
+
+def plugin_timeout(plugin):
+    # Whole run for root plugins, each process() call for stages; None = no limit.
+    return _lookup(Config.PLUGIN_TIMEOUTS, plugin, Config.PLUGIN_TIMEOUT) or None
+
+def plugin_priority(plugin):
+    return _lookup(Config.PLUGIN_PRIORITIES, plugin, plugin.priority)
+
+def incomplete(res, reason):
+    # Partial results keep what was found and say why the plugin stopped.
+    res["incomplete"] = reason
+    return res
+
+def unfinished(results):
+    # Sources whose run can't say what is gone: stopped early or failed
+    # (the pipeline tags a failed plugin's exception with its source).
+    sources = set()
+    for res in results:
+        if isinstance(res, dict) and res.get("incomplete"):
+            sources.add(res.get("source"))
+        elif isinstance(res, Exception) and getattr(res, "source", None):
+            sources.add(res.source)
+    return sources
+
+def is_streaming(method):
+    return inspect.isasyncgenfunction(method)
+
+@asynccontextmanager
+async def _no_gate():
+    yield
+
+class Pipeline:
+    def __init__(self, plugins, workers=None):
+        self.workers = workers or Config.STAGE_WORKERS
+        # Higher priority first: roots take the scheduler slots in this order.
+        plugins = sorted(plugins, key=plugin_priority, reverse=True)
+        self.roots = [p for p in plugins if not p.consumes]
+        self.stages = []
+
+        for plugin in plugins:
+            if not plugin.consumes:
+                continue
+            if self._feeds_back(plugin, plugins):
+                logger.error(f"[Pipeline] Ciclo detectado em {plugin.name} ({plugin.consumes} -> {plugin.produces}), ignorado")
+                continue
+            self.stages.append(plugin)
+
+        self.plugins = self.roots + self.stages
+
+        produced = {SEED_TYPE} | {p.produces for p in self.plugins}
+        for plugin in self.stages:
+            if plugin.consumes not in produced:
+                logger.warning(f"[Pipeline] {plugin.name} consome '{plugin.consumes}' mas nenhum plugin selecionado o produz")
+
+    @staticmethod
+    def _feeds_back(plugin, plugins):
+        # A stage may enrich its own type (consumes == produces): its output is
+        # never fed back to itself, so only loops through other stages count.
+        others = [p for p in plugins if p is not plugin]
+        reachable = set()
+        frontier = {p.produces for p in others if p.consumes == plugin.produces}
+        if plugin.produces != plugin.consumes:
+            frontier.add(plugin.produces)
+        while frontier:
+            dtype = frontier.pop()
+            if dtype is None or dtype in reachable:
+                continue
+            reachable.add(dtype)
+            frontier.update(p.produces for p in others if p.consumes == dtype)
+        return plugin.consumes in reachable
+
+    @staticmethod
+    def summary(plugin, found):
+        return {
+            "source": plugin.source or plugin.name,
+            "type": plugin.produces,
+            "data": sorted(found, key=str)
+        }
+
+    async def run(self, target, http, gate=None, on_result=None, on_item=None, journal=None, deadline=None):
+        # Plugins may return a dict or be async generators yielding findings one at
+        # a time; either way every finding is published downstream and to on_item
+        # as soon as it exists. `gate` wraps each root run (scheduler slots).
+        # With a journal, progress is recorded as it happens and whatever it
+        # already holds for this target is replayed instead of redone.
+        # Past `deadline` (time.monotonic()) every plugin still running is
+        # cancelled and reports what it found so far, marked incomplete.
+        gate = gate or _no_gate
+        stopped = "cancelled"
+        resumed = journal.state(target) if journal else {}
+
+        seen = {}
+        queues = {id(s): asyncio.Queue() for s in self.stages}
+        # Producers each stage still waits on before its input is complete.
+        pending = {
+            id(s): sum(1 for p in self.plugins if p.produces == s.consumes and p is not s)
+            for s in self.stages
+        }
+
+        results = []
+
+        def emit(dtype, item, origin=None):
+            bucket = seen.get(dtype)
+            if bucket is None:
+                bucket = seen[dtype] = new_bucket(dtype)
+            size = len(bucket)
+            bucket.add(item)
+            if len(bucket) == size:
+                return
+            for consumer in self.stages:
+                if consumer.consumes == dtype and consumer is not origin:
+                    queues[id(consumer)].put_nowait(item)
+
+        def publish(plugin, found, item, replay=False):
+            size = len(found)
+            found.add(item)
+            if len(found) == size:
+                return
+            if plugin.produces:
+                emit(plugin.produces, item, plugin)
+            if replay:
+                return
+            if journal:
+                journal.found(target, plugin.source or plugin.name, item)
+            if on_item:
+                on_item(target, plugin, item)
+
+        def restore(plugin, found):
+            # Findings journaled before the crash go downstream again but are
+            # not re-recorded or re-sunk.
+            saved = resumed.get(plugin.source or plugin.name)
+            if saved:
+                for item in saved.found:
+                    publish(plugin, found, item, replay=True)
+            return saved
+
+        def close(consumer):
+            for _ in range(self.workers):
+                queues[id(consumer)].put_nowait(None)
+
+        def finish(plugin, res, started, found):
+            label = plugin.source or plugin.name
+            metrics.observe("recon_plugin_seconds", time.perf_counter() - started, plugin=label)
+            metrics.inc("recon_plugin_items_total", len(found), plugin=label)
+            if isinstance(res, Exception):
+                metrics.inc("recon_plugin_errors_total", plugin=label)
+
+            results.append(res)
+            if on_result:
+                on_result(target, res)
+            for consumer in self.stages:
+                if consumer.consumes == plugin.produces and consumer is not plugin:
+                    pending[id(consumer)] -= 1
+                    if pending[id(consumer)] == 0:
+                        close(consumer)
+
+        async def root(plugin):
+            found = new_bucket(plugin.produces)
+            started = time.perf_counter()
+            saved = restore(plugin, found)
+            if saved and saved.done:
+                res = dict(saved.res or self.summary(plugin, found))
+                if res.get("data") is None:
+                    # List results were journaled item by item.
+                    res["data"] = sorted(found, key=str)
+                finish(plugin, res, started, found)
+                return
+            limit = plugin_timeout(plugin)
+            timer = asyncio.timeout(limit)
+            try:
+                async with gate():
+                    started = time.perf_counter()
+                    async with timer:
+                        if is_streaming(plugin.run):
+                            async for item in plugin.run(target, http):
+                                publish(plugin, found, item)
+                            res = self.summary(plugin, found)
+                        else:
+                            res = await plugin.run(target, http)
+                            if isinstance(res, dict) and isinstance(res.get("data"), list):
+                                for item in res["data"]:
+                                    publish(plugin, found, item)
+            except asyncio.CancelledError:
+                finish(plugin, incomplete(self.summary(plugin, found), stopped), started, found)
+                raise
+            except Incomplete as e:
+                res = incomplete(self.summary(plugin, found), e.reason)
+            except Exception as e:
+                res = e
+                e.source = plugin.source or plugin.name
+                if timer.expired():
+                    logger.warning(f"[{plugin.name}] Tempo esgotado ({limit:g}s) em {target}, resultados parciais")
+                    metrics.inc("recon_plugin_timeouts_total", plugin=plugin.source or plugin.name)
+                    res = incomplete(self.summary(plugin, found), "timeout")
+            if journal and isinstance(res, dict) and not res.get("incomplete"):
+                journal.plugin_done(target, plugin.source or plugin.name, res)
+            finish(plugin, res, started, found)
+
+        async def stage(plugin):
+            queue = queues[id(plugin)]
+            found = new_bucket(plugin.produces)
+            started = time.perf_counter()
+            streaming = is_streaming(plugin.process)
+            saved = restore(plugin, found)
+            skip = saved.inputs if saved else ()
+            label = plugin.source or plugin.name
+            limit = plugin_timeout(plugin)
+            timeouts = 0
+
+            async def worker():
+                nonlocal timeouts
+                while (item := await queue.get()) is not None:
+                    if item in skip:
+                        continue
+                    timer = asyncio.timeout(limit)
+                    try:
+                        async with timer:
+                            if streaming:
+                                async for out in plugin.process(item, target, http):
+                                    publish(plugin, found, out)
+                            else:
+                                for out in await plugin.process(item, target, http) or []:
+                                    publish(plugin, found, out)
+                        if journal:
+                            journal.processed(target, label, item)
+                    except Exception as e:
+                        if timer.expired():
+                            timeouts += 1
+                            metrics.inc("recon_plugin_timeouts_total", plugin=label)
+                        else:
+                            metrics.inc("recon_plugin_errors_total", plugin=label)
+                        logger.debug("[%s] %s: %r", plugin.name, item, e)
+
+            try:
+                await asyncio.gather(*(worker() for _ in range(self.workers)))
+            except asyncio.CancelledError:
+                finish(plugin, incomplete(self.summary(plugin, found), stopped), started, found)
+                raise
+            res = self.summary(plugin, found)
+            if timeouts:
+                logger.warning(f"[{plugin.name}] {timeouts} itens excederam {limit:g}s em {target}, resultados parciais")
+                incomplete(res, "timeout")
+            finish(plugin, res, started, found)
+
+        emit(SEED_TYPE, target)
+        for consumer in self.stages:
+            if not pending[id(consumer)]:
+                close(consumer)
+
+        tasks = [asyncio.ensure_future(root(p)) for p in self.roots]
+        tasks += [asyncio.ensure_future(stage(s)) for s in self.stages]
+        try:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            _, running = await asyncio.wait(tasks, timeout=timeout)
+            if running:
+                stopped = "deadline"
+                logger.warning(f"[Pipeline] Prazo esgotado em {target}: {len(running)} plugins interrompidos, resultados parciais")
+        except asyncio.CancelledError:
+            running = [t for t in tasks if not t.done()]
+            raise
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.wait(running)
+        return results
@@ -1,35 +1,168 @@
+import ast
+import hashlib
 import importlib
-import pkgutil
-import inspect
-import sys
+import importlib.util
+import json
+from pathlib import Path
 from core.base_module import BaseModule
+from core.config import Config
 from core.logger import logger
 
+MANIFEST_FIELDS = ("name", "description", "category", "consumes", "produces", "source")
+
 class PluginLoader:
-    def __init__(self, modules_package="modules"):
+    def __init__(self, modules_package="modules", manifest_path=None):
         self.modules_package = modules_package
+        self.manifest_path = Path(manifest_path or Config.PLUGIN_MANIFEST)
         self.plugins = []
+        self.errors = []
 
-    def load_all(self):
+    def _package_dir(self):
+        spec = importlib.util.find_spec(self.modules_package)
+        return Path(list(spec.submodule_search_locations)[0])
+
+    def _sources(self, root):
+        return sorted(p for p in root.rglob("*.py") if p.name != "__init__.py")
+
+    def _signature(self, files):
+        digest = hashlib.sha256()
+        for path in files:
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _base_name(node):
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            return node.attr
+        return None
+
+    def _scan_file(self, path, module_name):
+        # Reads plugin metadata straight from the source (class attributes and
+        # constant self.X assignments in __init__) so nothing gets imported.
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        entries = []
+
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            if "BaseModule" not in (self._base_name(b) for b in node.bases):
+                continue
+
+            attrs = {}
+            for stmt in node.body:
+                if isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.Constant):
+                    for target in stmt.targets:
+                        if isinstance(target, ast.Name):
+                            attrs[target.id] = stmt.value.value
+                if isinstance(stmt, ast.FunctionDef) and stmt.name == "__init__":
+                    for sub in ast.walk(stmt):
+                        if not (isinstance(sub, ast.Assign) and isinstance(sub.value, ast.Constant)):
+                            continue
+                        for target in sub.targets:
+                            if (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                                    and target.value.id == "self"):
+                                attrs[target.attr] = sub.value.value
+
+            entry = {"module": module_name, "class": node.name}
+            for field in MANIFEST_FIELDS:
+                entry[field] = attrs.get(field)
+            entry["name"] = entry["name"] or node.name
+            entry["category"] = entry["category"] or "generic"
+            entries.append(entry)
+
+        return entries
+
+    def manifest(self):
+        root = self._package_dir()
+        files = self._sources(root)
+        signature = self._signature(files)
+
+        try:
+            cached = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if cached.get("signature") == signature and cached.get("package") == self.modules_package:
+                return cached["plugins"]
+        except (OSError, ValueError):
+            pass
+
+        entries = []
+        for path in files:
+            rel = path.relative_to(root).with_suffix("")
+            module_name = ".".join((self.modules_package, *rel.parts))
+            try:
+                entries.extend(self._scan_file(path, module_name))
+            except (OSError, SyntaxError, UnicodeDecodeError) as e:
+                self.errors.append(f"{module_name}: {e}")
+                logger.error(f"[Loader] Falha ao indexar {module_name}: {e}")
+
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            self.manifest_path.write_text(json.dumps({
+                "package": self.modules_package,
+                "signature": signature,
+                "plugins": entries
+            }, indent=2), encoding="utf-8")
+        except OSError as e:
+            logger.debug(f"[Loader] Manifesto não salvo: {e}")
+
+        return entries
+
+    @staticmethod
+    def _matches(entry, wanted):
+        keys = {
+            entry["class"].lower(),
+            entry["name"].lower(),
+            entry["module"].rsplit(".", 1)[-1].lower(),
+            (entry.get("source") or "").lower()
+        }
+        return bool(keys & wanted)
+
+    def select(self, entries, modules=None, exclude=None, categories=None):
+        modules = {m.lower() for m in modules or []}
+        exclude = {m.lower() for m in exclude or []}
+        categories = {c.lower() for c in categories or []}
+
+        selected = []
+        for entry in entries:
+            if modules and not self._matches(entry, modules):
+                continue
+            if categories and entry["category"].lower() not in categories:
+                continue
+            if exclude and (self._matches(entry, exclude) or entry["category"].lower() in exclude):
+                continue
+            selected.append(entry)
+        return selected
+
+    def load(self, modules=None, exclude=None, categories=None):
         logger.info(f"Carregando plugins de: {self.modules_package}")
         try:
-            package = importlib.import_module(self.modules_package)
-
-            prefix = package.__name__ + "."
-            for _, name, _ in pkgutil.walk_packages(package.__path__, prefix):
-                try:
-                    module = importlib.import_module(name)
-                    for member_name, member_obj in inspect.getmembers(module):
-                        if (inspect.isclass(member_obj) and 
-                            issubclass(member_obj, BaseModule) and 
-                            member_obj is not BaseModule):
-                            
-                            instance = member_obj()
-                            self.plugins.append(instance)
-                            logger.debug(f"Carregado: [cyan]{instance.name}[/cyan]")
-                except Exception as e:
-                    pass 
+            entries = self.select(self.manifest(), modules, exclude, categories)
         except Exception as e:
             logger.error(f"Erro crítico no loader: {e}")
-        
-        return self.plugins
\ No newline at end of file
+            return self.plugins
+
+        self.plugins.extend(self.instantiate(entries))
+        return self.plugins
+
+    def instantiate(self, entries):
+        # Fresh plugin instances for the given manifest entries; modules are
+        # imported once and reused by later calls.
+        plugins = []
+        for entry in entries:
+            try:
+                module = importlib.import_module(entry["module"])
+                cls = getattr(module, entry["class"])
+                if not (isinstance(cls, type) and issubclass(cls, BaseModule)):
+                    raise TypeError(f"{entry['class']} não é um BaseModule")
+                instance = cls()
+                plugins.append(instance)
+                logger.debug(f"Carregado: [cyan]{instance.name}[/cyan]")
+            except Exception as e:
+                self.errors.append(f"{entry['module']}.{entry['class']}: {e}")
+                logger.error(f"[Loader] Falha ao carregar {entry['module']}.{entry['class']}: {e!r}")
+        return plugins
+
+    def load_all(self):
+        return self.load()
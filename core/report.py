@@ -1,25 +1,174 @@
+import base64
+import html
 import json
 import os
+import zlib
 from datetime import datetime
 from pathlib import Path
+from core.config import Config
+
+PARTIAL = " &middot; PARTIAL"
+
+# JSON embedded in <script> must not contain markup the HTML tokenizer acts
+# on ("</script>", "<!--<script>"); the \uXXXX forms are still valid JSON.
+SCRIPT_SAFE = str.maketrans({"<": "\\u003c", ">": "\\u003e", "&": "\\u0026"})
+
+DOM_SCRIPT = """    <script>
+        $(document).ready(function() {
+            $('.result-table').DataTable({
+                "paging": true,
+                "ordering": true,
+                "info": true,
+                "pageLength": 10,
+                "language": {
+                    "search": "FILTER RESULTS:",
+                    "lengthMenu": "SHOW _MENU_"
+                }
+            });
+        });
+    </script>"""
+
+# Data lives in <script> blocks (plain or gzip+base64) and is rendered on demand
+# by DataTables with deferRender + Scroller, so only visible rows hit the DOM.
+JSON_SCRIPT = """    <script>
+        const CRITICAL = new Set(['21', '22', '3389', '445']);
+
+        function escapeHtml(value) {
+            return String(value).replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]));
+        }
+
+        function renderItem(label, value) {
+            // "port_scan [+]" in --diff reports renders like "port_scan".
+            const source = String(label).split(' [')[0];
+            const text = escapeHtml(value);
+            if (source === 'fingerprint') {
+                const [endpoint, ...service] = String(value).split(' ');
+                return "<span class='badge badge-port'>" + escapeHtml(endpoint) + "</span> " + escapeHtml(service.join(' '));
+            }
+            if (source !== 'port_scan') return text;
+            const port = String(value).split(':').pop();
+            if (CRITICAL.has(port)) {
+                return "<span class='badge badge-crit'>" + text + "</span> <span style='color:var(--danger)'>CRITICAL SERVICE</span>";
+            }
+            return "<span class='badge badge-port'>" + text + "</span> TCP OPEN";
+        }
+
+        async function loadData(el) {
+            if (!el.dataset.gz) return JSON.parse(el.textContent);
+            const bytes = Uint8Array.from(atob(el.textContent.trim()), c => c.charCodeAt(0));
+            const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+            return JSON.parse(await new Response(stream).text());
+        }
+
+        $(document).ready(function() {
+            $('.result-table').each(async function() {
+                const table = $(this);
+                const items = await loadData(document.getElementById(table.data('src')));
+                const source = table.data('source');
+                table.DataTable({
+                    "data": items.map(v => [v]),
+                    "columns": [{ "render": (value, type) => type === 'display' ? renderItem(source, value) : value }],
+                    "deferRender": true,
+                    "scroller": true,
+                    "scrollY": 420,
+                    "scrollCollapse": true,
+                    "ordering": true,
+                    "info": true,
+                    "language": {
+                        "search": "FILTER RESULTS:",
+                        "emptyTable": "No data found during this scan."
+                    }
+                });
+            });
+        });
+    </script>"""
+
+class _Base64Writer:
+    # Streams bytes into a text file as base64, carrying partial 3-byte groups over.
+    def __init__(self, handle):
+        self.handle = handle
+        self.pending = b""
+
+    def write(self, data: bytes):
+        data = self.pending + data
+        cut = len(data) - len(data) % 3
+        self.handle.write(base64.b64encode(data[:cut]).decode("ascii"))
+        self.pending = data[cut:]
+
+    def close(self):
+        self.handle.write(base64.b64encode(self.pending).decode("ascii"))
+        self.pending = b""
 
 class ReportGenerator:
-    def __init__(self, output_dir="results"):
+    def __init__(self, output_dir="results", mode=None, compress=None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.mode = mode or Config.REPORT_MODE
+        self.compress = Config.REPORT_COMPRESS if compress is None else compress
 
-    def generate(self, target: str, results: dict):
+    def generate(self, target: str, results: dict, incomplete=()):
         stats = self._calculate_stats(results)
         
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         filename = self.output_dir / f"report_{target.replace('.', '_')}.html"
-        html_content = self._build_html(target, timestamp, results, stats)
+
+        mode = self.mode
+        if mode == "auto":
+            mode = "json" if stats["total_assets"] > Config.REPORT_DOM_LIMIT else "html"
 
         with open(filename, "w", encoding="utf-8") as f:
-            f.write(html_content)
+            f.write(self._head(target, timestamp, stats))
+            for index, (source, data) in enumerate(results.items()):
+                partial = source.rsplit(" [", 1)[0] in incomplete
+                if mode == "json":
+                    self._write_data_card(f, index, source, data, partial)
+                else:
+                    f.write(self._render_plugin_card(source, data, partial))
+            f.write(self._foot(JSON_SCRIPT if mode == "json" else DOM_SCRIPT))
 
         return str(filename)
 
+    def _write_data_card(self, f, index, source, data, partial=False):
+        if isinstance(data, dict):
+            data = [f"{k}: {v}" for k, v in data.items()]
+        elif not isinstance(data, list):
+            data = [data]
+
+        f.write(f"""
+        <div class="plugin-section">
+            <div class="plugin-header">
+                <div class="plugin-title">MODULE :: {html.escape(source.upper())}</div>
+                <div class="badge">{len(data)} ITEMS{PARTIAL if partial else ""}</div>
+            </div>
+            <table class="result-table display" data-src="data-{index}" data-source="{html.escape(source)}">
+                <thead>
+                    <tr><th>EXTRACTED DATA</th></tr>
+                </thead>
+            </table>
+""")
+        gz = ' data-gz="1"' if self.compress else ""
+        f.write(f'            <script type="application/json" id="data-{index}"{gz}>')
+
+        chunks = json.JSONEncoder(separators=(",", ":"), default=str).iterencode(data)
+        if self.compress:
+            out = _Base64Writer(f)
+            packer = zlib.compressobj(6, zlib.DEFLATED, 31)
+            batch, size = [], 0
+            for chunk in chunks:
+                batch.append(chunk)
+                size += len(chunk)
+                if size >= 65536:
+                    out.write(packer.compress("".join(batch).encode("utf-8")))
+                    batch, size = [], 0
+            out.write(packer.compress("".join(batch).encode("utf-8")))
+            out.write(packer.flush())
+            out.close()
+        else:
+            for chunk in chunks:
+                f.write(chunk.translate(SCRIPT_SAFE))
+
+        f.write("</script>\n        </div>\n")
+
     def _calculate_stats(self, results):
         stats = {
             "total_assets": 0,
@@ -41,20 +190,16 @@ class ReportGenerator:
             
         return stats
 
-    def _build_html(self, target, timestamp, results, stats):
-        plugin_sections = ""
-        for source, data in results.items():
-            plugin_sections += self._render_plugin_card(source, data)
-
-        return f"""
-<!DOCTYPE html>
+    def _head(self, target, timestamp, stats):
+        return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>RECON// {target}</title>
+    <title>RECON// {html.escape(target)}</title>
     
     <link rel="stylesheet" href="https://cdn.datatables.net/1.13.7/css/jquery.dataTables.min.css">
+    <link rel="stylesheet" href="https://cdn.datatables.net/scroller/2.3.0/css/scroller.dataTables.min.css">
     <link href="https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;700&family=Inter:wght@400;600&display=swap" rel="stylesheet">
     
     <style>
@@ -207,7 +352,7 @@ class ReportGenerator:
     <div class="header">
         <div class="brand">RECON <span style="color:white">//</span> 1.0.0V</div>
         <div class="target-info">
-            <div>TARGET: <strong style="color: white;">{target}</strong></div>
+            <div>TARGET: <strong style="color: white;">{html.escape(target)}</strong></div>
             <div>SCAN ID: {int(datetime.now().timestamp())}</div>
             <div>DATE: {timestamp}</div>
         </div>
@@ -233,8 +378,10 @@ class ReportGenerator:
     </div>
 
     <div class="content">
-        {plugin_sections}
-    </div>
+"""
+
+    def _foot(self, scripts):
+        return f"""    </div>
 
     <footer style="text-align: center; color: var(--text-dim); margin-top: 50px; font-size: 0.8rem;">
         GENERATED BY RECON 1.0.0V • CONFIDENTIAL
@@ -242,54 +389,50 @@ class ReportGenerator:
 
     <script src="https://code.jquery.com/jquery-3.7.0.min.js"></script>
     <script src="https://cdn.datatables.net/1.13.7/js/jquery.dataTables.min.js"></script>
-    <script>
-        $(document).ready(function() {{
-            $('.result-table').DataTable({{
-                "paging": true,
-                "ordering": true,
-                "info": true,
-                "pageLength": 10,
-                "language": {{
-                    "search": "FILTER RESULTS:",
-                    "lengthMenu": "SHOW _MENU_"
-                }}
-            }});
-        }});
-    </script>
+    <script src="https://cdn.datatables.net/scroller/2.3.0/js/dataTables.scroller.min.js"></script>
+{scripts}
 </body>
 </html>
 """
 
-    def _render_plugin_card(self, source, data):
-        rows = ""
+    def _render_plugin_card(self, source, data, partial=False):
+        rows = []
+        # "port_scan [+]" in --diff reports renders like "port_scan".
+        kind = source.rsplit(" [", 1)[0]
         
         if isinstance(data, list):
             for item in data:
-          
-                val_str = str(item)
-                if source == "port_scan" and val_str in ['21', '22', '3389', '445']:
+                # Every value is remote input (banners, TXT records, CT names); escape it.
+                val_str = html.escape(str(item))
+                port_str = val_str.rsplit(":", 1)[-1]
+                if kind == "port_scan" and port_str in ['21', '22', '3389', '445']:
                     item_html = f"<span class='badge badge-crit'>{val_str}</span> <span style='color:var(--danger)'>CRITICAL SERVICE</span>"
-                elif source == "port_scan":
+                elif kind == "port_scan":
                     item_html = f"<span class='badge badge-port'>{val_str}</span> TCP OPEN"
+                elif kind == "fingerprint":
+                    endpoint, _, service = val_str.partition(" ")
+                    item_html = f"<span class='badge badge-port'>{endpoint}</span> {service}"
                 else:
                     item_html = val_str
                 
-                rows += f"<tr><td>{item_html}</td></tr>"
+                rows.append(f"<tr><td>{item_html}</td></tr>")
         
         elif isinstance(data, dict):
             for k, v in data.items():
-                rows += f"<tr><td><strong>{k}</strong>: {v}</td></tr>"
+                rows.append(f"<tr><td><strong>{html.escape(str(k))}</strong>: {html.escape(str(v))}</td></tr>")
         else:
-            rows = f"<tr><td>{data}</td></tr>"
+            rows.append(f"<tr><td>{html.escape(str(data))}</td></tr>")
 
         if not rows:
-            rows = "<tr><td style='color: var(--text-dim)'>No data found during this scan.</td></tr>"
+            rows.append("<tr><td style='color: var(--text-dim)'>No data found during this scan.</td></tr>")
+
+        rows = "".join(rows)
 
         return f"""
         <div class="plugin-section">
             <div class="plugin-header">
-                <div class="plugin-title">MODULE :: {source.upper()}</div>
-                <div class="badge">{len(data) if isinstance(data, list) else 1} ITEMS</div>
+                <div class="plugin-title">MODULE :: {html.escape(source.upper())}</div>
+                <div class="badge">{len(data) if isinstance(data, list) else 1} ITEMS{PARTIAL if partial else ""}</div>
             </div>
             <table class="result-table display">
                 <thead>
@@ -0,0 +1,282 @@
+import asyncio
+import ipaddress
+import secrets
+import time
+from functools import partial
+import aiodns
+from aiodns import error as ares
+from aiodns.error import DNSError
+from core.adaptive import AdaptiveLimit
+from core.config import Config
+from core.domains import in_scope
+from core.logger import logger
+from core.metrics import metrics
+from core.resolver_pool import ResolverPool, load_resolvers
+
+DNS_ERRORS = {
+    ares.ARES_ENOTFOUND: "nxdomain",
+    ares.ARES_ENODATA: "nodata",
+    ares.ARES_ETIMEOUT: "timeout",
+    ares.ARES_ESERVFAIL: "servfail",
+    ares.ARES_EREFUSED: "refused",
+}
+
+RETRYABLE = ("timeout", "servfail", "refused", "error")
+
+RECORD_FIELDS = {
+    "A": "addr",
+    "AAAA": "addr",
+    "CNAME": "cname",
+    "MX": "exchange",
+    "NS": "nsdname",
+    "PTR": "dname",
+    "TXT": "data",
+}
+
+# c-ares backed resolver over a pool of nameservers: queries are pipelined on
+# one channel per resolver instead of a thread per lookup, failed queries are
+# retried on a different resolver and suspicious answers are cross-checked.
+class AsyncResolver:
+    def __init__(self, nameservers=None, timeout=None, tries=None, concurrency=None, qps=None):
+        if not nameservers and Config.DNS_RESOLVERS_FILE:
+            nameservers = load_resolvers(Config.DNS_RESOLVERS_FILE)
+        self.nameservers = list(nameservers or Config.DNS_NAMESERVERS)
+        self.timeout = timeout or Config.DNS_TIMEOUT
+        self.tries = tries or Config.DNS_TRIES
+        self.concurrency = concurrency or Config.DNS_CONCURRENCY
+        self.pool = ResolverPool(self.nameservers, qps, self.timeout)
+        # Queries on the wire, adapted between DNS_ADAPTIVE's floor and `concurrency`.
+        self.limit = AdaptiveLimit("dns", self.concurrency, *Config.DNS_ADAPTIVE)
+        self.loop = None
+        self._metrics = {}
+        self._wildcards = {}
+
+    @staticmethod
+    def _parse(rtype, result):
+        qtype = aiodns.query_type_map[rtype]
+        field = RECORD_FIELDS.get(rtype)
+        answers = []
+
+        for record in result.answer:
+            if record.type != qtype:
+                continue
+            value = getattr(record.data, field) if field else str(record.data)
+            if isinstance(value, bytes):
+                value = value.decode("utf-8", "replace")
+            answers.append(value.rstrip(".") if rtype != "TXT" else value)
+
+        return answers
+
+    def _submit(self, name, rtype, server):
+        try:
+            if self.loop is None:
+                self.loop = asyncio.get_running_loop()
+            fut = server.channel().query_dns(name, rtype)
+        except Exception as e:
+            fut = asyncio.get_running_loop().create_future()
+            fut.set_exception(e)
+            return fut
+        return fut
+
+    def _series(self, rtype):
+        series = self._metrics.get(rtype)
+        if series is None:
+            series = self._metrics[rtype] = (
+                rtype,
+                metrics.counter("recon_dns_queries_total", type=rtype),
+                metrics.histogram("recon_dns_query_seconds", type=rtype)
+            )
+        return series
+
+    def _record(self, rtype, fut, elapsed, server):
+        # Returns the error kind (None on success); NXDOMAIN/NODATA are answers,
+        # so they count as healthy for the resolver.
+        _, queries, latency = self._series(rtype)
+        queries.inc()
+        latency.observe(elapsed)
+        kind = None
+        if fut.cancelled():
+            kind = "cancelled"
+        elif (err := fut.exception()) is not None:
+            code = err.args[0] if isinstance(err, DNSError) and err.args else None
+            kind = DNS_ERRORS.get(code, "error")
+            metrics.inc("recon_dns_errors_total", type=rtype, kind=kind)
+        answered = kind in (None, "nxdomain", "nodata")
+        self.pool.report(server, answered, elapsed)
+        self.limit.record("ok" if answered else kind, elapsed)
+        return kind
+
+    def _collect(self, name, rtype, fut):
+        try:
+            return self._parse(rtype, fut.result())
+        except DNSError:
+            return []
+        except Exception as e:
+            logger.debug("[DNS] %s %s: %s", rtype, name, e)
+            return []
+
+    def _suspicious(self, rtype, answers):
+        # Bogon answers are what hijacking/filtering resolvers hand out.
+        if Config.DNS_VERIFY == "all":
+            return True
+        if Config.DNS_VERIFY != "suspicious" or rtype not in ("A", "AAAA"):
+            return False
+        for answer in answers:
+            try:
+                ip = ipaddress.ip_address(answer)
+            except ValueError:
+                continue
+            if ip.is_private or ip.is_loopback or ip.is_unspecified or ip.is_reserved or ip.is_multicast:
+                return True
+        return False
+
+    async def _verify(self, name, rtype, answers, server):
+        # Asks a second, best-scoring resolver. Agreement keeps the answer; a
+        # disagreement trusts the second opinion and marks the first one down.
+        other = self.pool.trusted(exclude=server)
+        if other is None:
+            return answers
+        started = time.perf_counter()
+        fut = self._submit(name, rtype, other)
+        try:
+            await fut
+        except Exception:
+            pass
+        kind = self._record(rtype, fut, time.perf_counter() - started, other)
+        if kind not in (None, "nxdomain", "nodata"):
+            return answers
+        second = self._collect(name, rtype, fut)
+        if set(second) == set(answers):
+            metrics.inc("recon_dns_verify_total", result="agree")
+            return answers
+        metrics.inc("recon_dns_verify_total", result="disagree")
+        self.pool.report(server, False, 0.0)
+        logger.debug("[DNS] %s divergiu de %s para %s: %s vs %s", server.address, other.address, name, answers, second)
+        return second
+
+    async def _check(self, name, rtype, fut, server):
+        answers = self._collect(name, rtype, fut)
+        if answers and len(self.pool) > 1 and self._suspicious(rtype, answers):
+            answers = await self._verify(name, rtype, answers, server)
+        return answers
+
+    async def resolve(self, name: str, rtype: str = "A") -> list:
+        server = None
+        await self.limit.acquire()
+        try:
+            for attempt in range(self.tries):
+                server = await self.pool.acquire(exclude=server)
+                started = time.perf_counter()
+                fut = self._submit(name, rtype, server)
+                try:
+                    await fut
+                except Exception:
+                    pass
+                if self._record(rtype, fut, time.perf_counter() - started, server) not in RETRYABLE:
+                    break
+        finally:
+            self.limit.release()
+        return await self._check(name, rtype, fut, server)
+
+    async def resolve_many(self, names, types=("A",), pace=None):
+        # Lazily walks names x types keeping at most `limit` queries on the wire
+        # (slots shared with resolve()) and yields (name, rtype, answers) in
+        # completion order. `pace` (a TokenBucket) caps the overall query rate
+        # on top of per-resolver caps.
+        done = asyncio.Queue()
+        inflight = 0
+
+        def on_done(fut, name, rtype, server, attempt, started):
+            # The query is off the wire: its slot goes back now, not when the
+            # consumer gets to it, so a generator suspended at `yield` (whose
+            # consumer may call resolve()) never sits on finished slots.
+            self.limit.release()
+            done.put_nowait((name, rtype, server, attempt, fut, time.perf_counter() - started))
+
+        async def submit(name, rtype, attempt=0, exclude=None):
+            # Called holding a slot; on_done releases it.
+            try:
+                server = await self.pool.acquire(exclude)
+                fut = self._submit(name, rtype, server)
+            except BaseException:
+                self.limit.release()
+                raise
+            fut.add_done_callback(partial(on_done, name=name, rtype=rtype, server=server, attempt=attempt, started=time.perf_counter()))
+
+        async def finish():
+            # None when the query went back on the wire to another resolver.
+            nonlocal inflight
+            name, rtype, server, attempt, fut, elapsed = await done.get()
+            if self._record(rtype, fut, elapsed, server) in RETRYABLE and attempt + 1 < self.tries:
+                await self.limit.acquire()
+                await submit(name, rtype, attempt + 1, server)
+                return None
+            inflight -= 1
+            return name, rtype, await self._check(name, rtype, fut, server)
+
+        for name in names:
+            for rtype in types:
+                # Our own completions free slots; only block on the limit
+                # when nothing of ours is pending.
+                while not self.limit.try_acquire():
+                    if not inflight:
+                        await self.limit.acquire()
+                        break
+                    if (result := await finish()) is not None:
+                        yield result
+
+                if pace:
+                    try:
+                        await pace.acquire()
+                    except BaseException:
+                        self.limit.release()
+                        raise
+                await submit(name, rtype)
+                inflight += 1
+
+        while inflight:
+            if (result := await finish()) is not None:
+                yield result
+
+    async def _probe_zone(self, zone, rtype):
+        labels = [f"{secrets.token_hex(8)}.{zone}" for _ in range(Config.WILDCARD_PROBES)]
+        batches = await asyncio.gather(*(self.resolve(label, rtype) for label in labels))
+        found = frozenset(answer for batch in batches for answer in batch)
+        if found:
+            logger.info(f"[DNS] Wildcard detectado em *.{zone} ({rtype}): {', '.join(sorted(found))}")
+        return found
+
+    async def wildcard(self, zone: str, rtype: str = "A") -> frozenset:
+        # Answer set of *.zone (empty when there is no wildcard). Probed once per
+        # zone and type; concurrent callers await the same probe.
+        key = (zone, rtype)
+        probe = self._wildcards.get(key)
+        if probe is None:
+            probe = self._wildcards[key] = asyncio.ensure_future(self._probe_zone(zone, rtype))
+        return await asyncio.shield(probe)
+
+    async def is_wildcard(self, name: str, answers, rtype: str = "A", scope: str = None) -> bool:
+        # True when every answer for `name` is one the parent zone's wildcard
+        # also returns. Zones outside `scope` (the target) are never probed.
+        if not answers or "." not in name:
+            return False
+        zone = name.split(".", 1)[1]
+        if scope and not in_scope(zone, scope):
+            return False
+        wild = await self.wildcard(zone, rtype)
+        if wild and wild.issuperset(answers):
+            metrics.inc("recon_dns_wildcard_filtered_total", type=rtype)
+            return True
+        return False
+
+    async def close(self):
+        await self.pool.close()
+
+_shared = None
+
+def get_resolver() -> AsyncResolver:
+    global _shared
+    loop = asyncio.get_running_loop()
+    if _shared is None or (_shared.loop is not None and _shared.loop is not loop):
+        _shared = AsyncResolver()
+    return _shared
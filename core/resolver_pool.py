@@ -0,0 +1,144 @@
+import asyncio
+import math
+import random
+import time
+import aiodns
+from core.config import Config
+from core.logger import logger
+from core.metrics import metrics
+
+def load_resolvers(path):
+    # One resolver per line (ip or ip:port); blank lines and # comments are skipped.
+    resolvers = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            address = line.split("#", 1)[0].strip()
+            if address and address not in resolvers:
+                resolvers.append(address)
+    return resolvers
+
+class Nameserver:
+    def __init__(self, address, qps, timeout):
+        self.address = address
+        self.qps = qps
+        self.timeout = timeout
+        self.tokens = float(max(1.0, qps))
+        self.updated = time.monotonic()
+        self.health = 1.0
+        self.latency = None
+        self.samples = 0
+        self.benched_until = 0.0
+        self._channel = None
+
+    def channel(self):
+        # One single-server c-ares channel each, so a failure is attributable
+        # to this resolver and retries can go elsewhere.
+        if self._channel is None:
+            self._channel = aiodns.DNSResolver(nameservers=[self.address], timeout=self.timeout, tries=1)
+        return self._channel
+
+    @property
+    def score(self):
+        # 0..1: success rate, discounted for latency above the target.
+        latency = self.latency or 0.0
+        return self.health / (1 + latency / Config.DNS_LATENCY_TARGET)
+
+    def wait(self, now):
+        if not self.qps:
+            return 0.0
+        self.tokens = min(self.qps, self.tokens + (now - self.updated) * self.qps)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.qps
+
+    def take(self):
+        if self.qps:
+            self.tokens -= 1
+
+    def observe(self, ok, elapsed):
+        self.samples += 1
+        self.health += 0.1 * ((1.0 if ok else 0.0) - self.health)
+        if ok:
+            self.latency = elapsed if self.latency is None else self.latency + 0.1 * (elapsed - self.latency)
+
+    async def close(self):
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+
+# Spreads queries over many resolvers: round-robin under per-resolver QPS caps,
+# skipping weak resolvers in proportion to their score and benching the ones
+# whose success rate falls below DNS_MIN_HEALTH for DNS_BENCH_SECONDS.
+class ResolverPool:
+    def __init__(self, addresses, qps=None, timeout=None):
+        qps = Config.DNS_RESOLVER_QPS if qps is None else qps
+        timeout = timeout or Config.DNS_TIMEOUT
+        self.servers = [Nameserver(a, qps, timeout) for a in dict.fromkeys(addresses)]
+        if not self.servers:
+            raise ValueError("resolver pool is empty")
+        self._cursor = 0
+
+    def __len__(self):
+        return len(self.servers)
+
+    def _pick(self, exclude=None):
+        now = time.monotonic()
+        count = len(self.servers)
+        fallback, fallback_wait = None, math.inf
+
+        for step in range(count):
+            i = (self._cursor + step) % count
+            server = self.servers[i]
+            if server is exclude or server.benched_until > now:
+                continue
+            wait = server.wait(now)
+            if wait < fallback_wait:
+                fallback, fallback_wait = server, wait
+            if wait or server.score < random.random():
+                continue
+            server.take()
+            self._cursor = i + 1
+            return server, 0.0
+
+        if fallback is None:
+            # Everything usable is benched or excluded: never stall, use the best left.
+            fallback = max((s for s in self.servers if s is not exclude), key=lambda s: s.score, default=exclude)
+            fallback_wait = fallback.wait(now)
+        if not fallback_wait:
+            fallback.take()
+        return fallback, fallback_wait
+
+    async def acquire(self, exclude=None) -> Nameserver:
+        while True:
+            server, wait = self._pick(exclude)
+            if not wait:
+                return server
+            await asyncio.sleep(wait)
+
+    def report(self, server, ok, elapsed):
+        now = time.monotonic()
+        if server.benched_until > now:
+            # Stragglers sent before the bench; they say nothing new.
+            return
+        server.observe(ok, elapsed)
+        if server.samples >= Config.DNS_MIN_SAMPLES and server.health < Config.DNS_MIN_HEALTH and len(self.servers) > 1:
+            server.benched_until = now + Config.DNS_BENCH_SECONDS
+            logger.warning(f"[DNS] Resolver {server.address} descartado por {Config.DNS_BENCH_SECONDS:.0f}s (sucesso {server.health:.0%})")
+            metrics.inc("recon_dns_resolver_benched_total", resolver=server.address)
+            # Back on probation after the bench: one more bad streak benches it again.
+            server.health = Config.DNS_MIN_HEALTH + 0.2
+            server.samples = 0
+
+    def trusted(self, exclude=None):
+        # Best-scoring healthy resolver other than `exclude`, for cross-checks.
+        now = time.monotonic()
+        candidates = [s for s in self.servers if s is not exclude and s.benched_until <= now]
+        return max(candidates, key=lambda s: s.score, default=None)
+
+    def export(self):
+        for server in self.servers:
+            metrics.set("recon_dns_resolver_score", round(server.score, 4), resolver=server.address)
+
+    async def close(self):
+        self.export()
+        for server in self.servers:
+            await server.close()
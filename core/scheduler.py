@@ -0,0 +1,111 @@
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from core.config import Config
+from core.domains import normalize
+from core.logger import logger
+from core.pipeline import Pipeline
+
+def read_targets(path):
+    seen = set()
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for number, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            target = normalize(line)
+            if target is None:
+                logger.warning(f"[Scheduler] Linha {number} ignorada, não é um hostname: {line[:100]}")
+                continue
+            if target in seen:
+                continue
+            seen.add(target)
+            yield target
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+def to_report_data(results):
+    return {r["source"]: r["data"] for r in results if isinstance(r, dict)}
+
+# Runs every plugin against many targets over one shared AsyncHTTP session.
+# Bounded on three levels: targets in flight, plugin runs globally, plugin runs per target;
+# and in time: TARGET_TIMEOUT per target, TIME_BUDGET for everything this scheduler runs.
+class Scheduler:
+    def __init__(self, plugins, http, max_targets=None, max_tasks=None, per_target=None, journal=None):
+        self.pipeline = Pipeline(plugins)
+        self.plugins = self.pipeline.plugins
+        self.http = http
+        self.journal = journal
+        self.target_timeout = Config.TARGET_TIMEOUT
+        self.expires = time.monotonic() + Config.TIME_BUDGET if Config.TIME_BUDGET else None
+        self.skipped = 0
+        self.max_targets = max_targets or Config.MAX_TARGETS
+        self.per_target = per_target or Config.PER_TARGET_TASKS
+        self._global = asyncio.Semaphore(max_tasks or Config.MAX_TASKS)
+
+    @asynccontextmanager
+    async def _slot(self, local):
+        async with local:
+            async with self._global:
+                yield
+
+    @property
+    def expired(self):
+        return self.expires is not None and time.monotonic() >= self.expires
+
+    def _deadline(self):
+        deadline = self.expires
+        if self.target_timeout:
+            own = time.monotonic() + self.target_timeout
+            deadline = own if deadline is None else min(deadline, own)
+        return deadline
+
+    async def run_target(self, target, on_result=None, on_item=None):
+        local = asyncio.Semaphore(self.per_target)
+        return await self.pipeline.run(
+            target,
+            self.http,
+            gate=lambda: self._slot(local),
+            on_result=on_result,
+            on_item=on_item,
+            journal=self.journal,
+            deadline=self._deadline()
+        )
+
+    async def run_many(self, targets, on_target=None, on_result=None, on_item=None):
+        queue = asyncio.Queue(maxsize=self.max_targets * 2)
+
+        async def producer():
+            if hasattr(targets, "__aiter__"):
+                async for target in targets:
+                    await queue.put(target)
+            else:
+                for target in targets:
+                    await queue.put(target)
+            for _ in range(self.max_targets):
+                await queue.put(None)
+
+        async def worker():
+            while (target := await queue.get()) is not None:
+                # Out of budget: drain the queue without starting anything new.
+                if self.expired:
+                    self.skipped += 1
+                    continue
+                try:
+                    results = await self.run_target(target, on_result, on_item)
+                except Exception as e:
+                    logger.error(f"[Scheduler] {target}: {e}")
+                    results = [e]
+                # A report or store failure costs this target, not the batch.
+                try:
+                    if on_target:
+                        on_target(target, results)
+                except Exception as e:
+                    logger.error(f"[Scheduler] {target}: falha ao gravar resultados: {e}")
+
+        await asyncio.gather(producer(), *(worker() for _ in range(self.max_targets)))
+        if self.skipped:
+            logger.warning(f"[Scheduler] Orçamento de tempo esgotado: {self.skipped} alvos não iniciados")
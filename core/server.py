@@ -0,0 +1,284 @@
+import asyncio
+import itertools
+import json
+import time
+from aiohttp import web
+from core.config import Config
+from core.domains import normalize
+from core.logger import logger
+from core.metrics import metrics
+from core.scheduler import Scheduler, to_report_data
+
+FINISHED = ("done", "failed", "cancelled")
+
+class Job:
+    def __init__(self, job_id, target, options):
+        self.id = job_id
+        self.target = target
+        self.options = options
+        self.status = "queued"
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.findings = []
+        self.results = []
+        self.report = None
+        self.error = None
+        self.task = None
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        # Wake every follower, then arm a fresh event for the next change.
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def add(self, plugin, item):
+        self.findings.append({"source": plugin.source or plugin.name, "type": plugin.produces, "value": item})
+        self._notify()
+
+    def close(self, status, error=None):
+        self.status = status
+        self.error = error
+        self.finished = time.time()
+        self._notify()
+
+    async def follow(self):
+        # Batches of findings: everything so far, then whatever arrived since
+        # the last batch, until the job ends.
+        sent = 0
+        while True:
+            changed = self._changed
+            if sent < len(self.findings):
+                batch = self.findings[sent:]
+                sent += len(batch)
+                yield batch
+            if self.status in FINISHED:
+                return
+            await changed.wait()
+
+    def summary(self, results=False):
+        out = {
+            "id": self.id,
+            "target": self.target,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "findings": len(self.findings)
+        }
+        if self.error:
+            out["error"] = self.error
+        if self.report:
+            out["report"] = self.report
+        partial = sorted(r["source"] for r in self.results if isinstance(r, dict) and r.get("incomplete"))
+        if partial:
+            out["incomplete"] = partial
+        if results:
+            out["results"] = to_report_data(self.results)
+        return out
+
+# Daemon mode: one event loop, one warm AsyncHTTP session (connection pool,
+# DNS cache, rate limits) and one plugin manifest serve every job. Jobs are
+# queued and run SERVE_JOBS at a time; each gets fresh plugin instances.
+class ScanServer:
+    def __init__(self, http, loader, store=None, report=None, defaults=None, workers=None, keep=None):
+        self.http = http
+        self.loader = loader
+        self.defaults = defaults or {}
+        self.store = store
+        self.report = report
+        self.workers = workers or Config.SERVE_JOBS
+        self.keep = keep or Config.SERVE_KEEP
+        self.manifest = loader.manifest()
+        self.jobs = {}
+        self.queue = asyncio.Queue()
+        self._ids = itertools.count(1)
+        self._tasks = []
+        self._runner = None
+
+    def submit(self, target, options):
+        job = Job(str(next(self._ids)), target, options)
+        self.jobs[job.id] = job
+        self.queue.put_nowait(job)
+        metrics.inc("recon_serve_jobs_total", status="submitted")
+        self._evict()
+        return job
+
+    def _evict(self):
+        # Finished jobs are kept for polling up to SERVE_KEEP, oldest dropped first.
+        finished = [j for j in self.jobs.values() if j.status in FINISHED]
+        for job in finished[:max(0, len(finished) - self.keep)]:
+            del self.jobs[job.id]
+
+    def _plugins(self, options):
+        # Selections a job leaves out fall back to the ones the daemon was started with.
+        pick = {key: options.get(key) or self.defaults.get(key) for key in ("modules", "exclude", "category")}
+        entries = self.loader.select(self.manifest, pick["modules"], pick["exclude"], pick["category"])
+        return self.loader.instantiate(entries)
+
+    async def _run(self, job):
+        plugins = self._plugins(job.options)
+        if not plugins:
+            raise ValueError("no plugins selected")
+        scheduler = Scheduler(plugins, self.http)
+        if job.options.get("timeout"):
+            scheduler.target_timeout = float(job.options["timeout"])
+        # Results are collected as plugins finish, so a cancelled job keeps them.
+        await scheduler.run_target(
+            job.target,
+            on_result=lambda _, res: job.results.append(res),
+            on_item=lambda _, plugin, item: job.add(plugin, item)
+        )
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            if job.status != "queued":
+                continue
+            job.status = "running"
+            job.started = time.time()
+            job.task = asyncio.ensure_future(self._run(job))
+            try:
+                try:
+                    await job.task
+                    status = "done"
+                except asyncio.CancelledError:
+                    if not job.task.cancelled():
+                        raise
+                    status = "cancelled"
+                # A failure here is the job's, never the worker's.
+                if self.store:
+                    self.store.record(job.target, job.results, job.started)
+                if self.report and job.options.get("report"):
+                    job.report = self.report.generate(job.target, to_report_data(job.results))
+                error = None
+            except Exception as e:
+                logger.error(f"[Serve] Job {job.id} ({job.target}) falhou: {e}")
+                status, error = "failed", str(e)
+            job.close(status, error)
+            metrics.inc("recon_serve_jobs_total", status=status)
+            metrics.observe("recon_serve_job_seconds", job.finished - job.started)
+
+    # HTTP API
+
+    @staticmethod
+    def _error(status, message):
+        return web.json_response({"error": message}, status=status)
+
+    def _job(self, request):
+        return self.jobs.get(request.match_info["id"])
+
+    async def _submit(self, request):
+        try:
+            body = await request.json()
+        except ValueError:
+            return self._error(400, "invalid JSON")
+        if not isinstance(body, dict):
+            return self._error(400, "expected a JSON object")
+        if not body.get("target"):
+            return self._error(400, "target is required")
+        target = normalize(str(body["target"]))
+        if not target:
+            return self._error(400, "target must be a hostname")
+
+        options = {}
+        for key in ("modules", "exclude", "category"):
+            value = body.get(key)
+            if isinstance(value, str):
+                value = [v.strip() for v in value.split(",") if v.strip()]
+            if value is not None and not (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+                return self._error(400, f"{key} must be a list of names")
+            options[key] = value
+        try:
+            options["timeout"] = float(body.get("timeout") or 0)
+        except (TypeError, ValueError):
+            return self._error(400, "timeout must be a number")
+        options["report"] = bool(body.get("report"))
+
+        job = self.submit(target, options)
+        if body.get("wait"):
+            # Long poll: answer once the job has finished.
+            async for _ in job.follow():
+                pass
+            return web.json_response(job.summary(results=True))
+        return web.json_response(job.summary(), status=202)
+
+    async def _list(self, _):
+        return web.json_response([job.summary() for job in self.jobs.values()])
+
+    async def _get(self, request):
+        job = self._job(request)
+        if job is None:
+            return self._error(404, "unknown job")
+        return web.json_response(job.summary(results=job.status in FINISHED))
+
+    async def _events(self, request):
+        # NDJSON: one line per finding as it is found, then the final summary.
+        job = self._job(request)
+        if job is None:
+            return self._error(404, "unknown job")
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        async for batch in job.follow():
+            await response.write("".join(json.dumps(f, default=str) + "\n" for f in batch).encode())
+        await response.write((json.dumps({"summary": job.summary()}) + "\n").encode())
+        await response.write_eof()
+        return response
+
+    async def _cancel(self, request):
+        job = self._job(request)
+        if job is None:
+            return self._error(404, "unknown job")
+        if job.status == "queued":
+            job.close("cancelled")
+        elif job.status == "running":
+            job.task.cancel()
+        return web.json_response(job.summary(), status=202)
+
+    async def _health(self, _):
+        counts = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return web.json_response({
+            "status": "ok",
+            "jobs": counts,
+            "plugins": [entry["source"] or entry["name"] for entry in self.manifest]
+        })
+
+    async def _metrics(self, _):
+        return web.Response(text=metrics.to_prometheus(), content_type="text/plain")
+
+    async def start(self, address):
+        # `address` is "HOST:PORT", "PORT" or a Unix socket path.
+        app = web.Application()
+        app.router.add_post("/jobs", self._submit)
+        app.router.add_get("/jobs", self._list)
+        app.router.add_get("/jobs/{id}", self._get)
+        app.router.add_get("/jobs/{id}/events", self._events)
+        app.router.add_delete("/jobs/{id}", self._cancel)
+        app.router.add_get("/health", self._health)
+        app.router.add_get("/metrics", self._metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+
+        if "/" in address:
+            site = web.UnixSite(self._runner, address)
+        else:
+            host, _, port = address.rpartition(":")
+            site = web.TCPSite(self._runner, host or "127.0.0.1", int(port))
+        await site.start()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        logger.info(f"[Serve] Aguardando jobs em {address} ({self.workers} simultâneos)")
+
+    async def wait(self):
+        await asyncio.gather(*self._tasks)
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        for job in self.jobs.values():
+            if job.task and not job.task.done():
+                job.task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._runner:
+            await self._runner.cleanup()
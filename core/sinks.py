@@ -0,0 +1,31 @@
+import json
+
+# Writes findings as JSON lines while plugins are still running.
+class JsonlSink:
+    def __init__(self, path, flush_every=500):
+        self.path = path
+        self.flush_every = flush_every
+        self.buffer = []
+        self.count = 0
+        self.handle = open(path, "a", encoding="utf-8")
+
+    def write(self, target, plugin, item):
+        self.buffer.append(json.dumps({
+            "target": target,
+            "source": plugin.source or plugin.name,
+            "type": plugin.produces,
+            "value": item
+        }, default=str))
+        self.count += 1
+        if len(self.buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.handle.write("\n".join(self.buffer) + "\n")
+            self.handle.flush()
+            self.buffer.clear()
+
+    def close(self):
+        self.flush()
+        self.handle.close()
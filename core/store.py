@@ -0,0 +1,145 @@
+import sqlite3
+import time
+from pathlib import Path
+from core.config import Config
+
+# One row per asset per run. first_seen is carried over from earlier runs of
+# the same target so the table doubles as an asset history.
+class ResultStore:
+    def __init__(self, path=None, batch=None):
+        self.path = Path(path or Config.STORE_PATH)
+        self.batch = batch or Config.STORE_BATCH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                target TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                finished_at REAL
+            );
+            -- Sources that ran in a run and whether they finished; a diff only
+            -- compares a source against the last run that finished it.
+            CREATE TABLE IF NOT EXISTS run_sources (
+                run_id INTEGER NOT NULL REFERENCES runs(id),
+                source TEXT NOT NULL,
+                complete INTEGER NOT NULL,
+                PRIMARY KEY (run_id, source)
+            );
+            CREATE TABLE IF NOT EXISTS assets (
+                run_id INTEGER NOT NULL REFERENCES runs(id),
+                target TEXT NOT NULL,
+                type TEXT NOT NULL,
+                source TEXT NOT NULL,
+                value TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_runs_target ON runs(target, id);
+            CREATE INDEX IF NOT EXISTS idx_assets_run ON assets(run_id);
+            CREATE INDEX IF NOT EXISTS idx_assets_target ON assets(target);
+            CREATE INDEX IF NOT EXISTS idx_assets_type ON assets(type);
+            CREATE INDEX IF NOT EXISTS idx_assets_source ON assets(source);
+            CREATE INDEX IF NOT EXISTS idx_assets_first_seen ON assets(first_seen);
+            CREATE INDEX IF NOT EXISTS idx_assets_last_seen ON assets(last_seen);
+            CREATE INDEX IF NOT EXISTS idx_assets_key ON assets(target, type, source, value);
+        """)
+
+    @staticmethod
+    def _values(data):
+        if isinstance(data, list):
+            return [str(v) for v in data]
+        if isinstance(data, dict):
+            return [f"{k}: {v}" for k, v in data.items()]
+        return [str(data)]
+
+    def record(self, target, results, started_at=None):
+        now = time.time()
+        cur = self._db.execute(
+            "INSERT INTO runs (target, started_at, finished_at) VALUES (?, ?, ?)",
+            (target, started_at or now, now)
+        )
+        run_id = cur.lastrowid
+
+        rows = []
+        for res in results:
+            if not isinstance(res, dict):
+                continue
+            dtype, source = res.get("type") or "info", res.get("source") or "unknown"
+            self._db.execute(
+                "INSERT OR IGNORE INTO run_sources (run_id, source, complete) VALUES (?, ?, ?)",
+                (run_id, source, int(not res.get("incomplete")))
+            )
+            for value in self._values(res.get("data", [])):
+                rows.append((run_id, target, dtype, source, value, target, dtype, source, value, now, now))
+                if len(rows) >= self.batch:
+                    self._insert(rows)
+                    rows = []
+        self._insert(rows)
+        self._db.commit()
+        return run_id
+
+    def _insert(self, rows):
+        if not rows:
+            return
+        self._db.executemany("""
+            INSERT INTO assets (run_id, target, type, source, value, first_seen, last_seen)
+            SELECT ?, ?, ?, ?, ?, COALESCE(
+                (SELECT MIN(first_seen) FROM assets WHERE target = ? AND type = ? AND source = ? AND value = ?),
+                ?
+            ), ?
+        """, rows)
+
+    def previous_run(self, target, run_id, source=None):
+        # Latest earlier run of the target; with `source`, the latest one that
+        # ran that source to completion (runs stored before run_sources existed
+        # count when they hold assets of it).
+        if source is None:
+            return self._db.execute(
+                "SELECT MAX(id) FROM runs WHERE target = ? AND id < ?", (target, run_id)
+            ).fetchone()[0]
+        return self._db.execute("""
+            SELECT MAX(id) FROM (
+                SELECT r.id FROM runs r JOIN run_sources s ON s.run_id = r.id
+                WHERE r.target = ? AND s.source = ? AND s.complete AND r.id < ?
+                UNION ALL
+                SELECT run_id FROM assets WHERE target = ? AND source = ? AND run_id < ?
+                    AND run_id NOT IN (SELECT run_id FROM run_sources)
+            )
+        """, (target, source, run_id, target, source, run_id)).fetchone()[0]
+
+    def diff(self, target, run_id, incomplete=()):
+        # Returns {"<source> [+]": [...new...], "<source> [-]": [...gone...]}.
+        # Each source that ran this time is compared with the last run that
+        # finished it, so a --modules subset neither drops the other sources nor
+        # makes them all new again on the next full run. Sources that stopped
+        # early or failed this run (`incomplete`) can't tell what is gone; they
+        # only report [+].
+        sources = [row[0] for row in self._db.execute("""
+            SELECT source FROM run_sources WHERE run_id = ?
+            UNION
+            SELECT DISTINCT source FROM assets WHERE run_id = ?
+            ORDER BY 1
+        """, (run_id, run_id))]
+        query = """
+            SELECT value FROM assets WHERE run_id = ? AND source = ?
+            EXCEPT
+            SELECT value FROM assets WHERE run_id = ? AND source = ?
+            ORDER BY value
+        """
+        changes = {}
+        for source in sources:
+            prev = self.previous_run(target, run_id, source)
+            for label, (a, b) in (("+", (run_id, prev)), ("-", (prev, run_id))):
+                if a is None or (label == "-" and source in incomplete):
+                    continue
+                values = [v for (v,) in self._db.execute(query, (a, source, b if b is not None else -1, source))]
+                if values:
+                    changes[f"{source} [{label}]"] = values
+        return changes
+
+    def close(self):
+        self._db.close()
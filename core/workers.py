@@ -0,0 +1,165 @@
+import asyncio
+import multiprocessing
+import queue
+import threading
+from collections import namedtuple
+from core.cache import ResponseCache
+from core.config import Config
+from core.http import AsyncHTTP, SharedLimits
+from core.logger import logger, setup_logger
+from core.metrics import metrics
+
+# Stands in for a plugin on the parent side; carries what sinks and reports read.
+PluginRef = namedtuple("PluginRef", "name source produces")
+
+# Query caps that live in per-process buckets; each worker gets its share so
+# N workers still send the configured rate to every resolver in total.
+SPLIT_RATES = ("DNS_RESOLVER_QPS", "BRUTE_QPS")
+
+def config_snapshot(workers=1):
+    config = {k: v for k, v in vars(Config).items() if k.isupper()}
+    for key in SPLIT_RATES:
+        if config[key]:
+            config[key] = max(1.0, config[key] / workers)
+    return config
+
+def _portable(result):
+    if isinstance(result, Exception):
+        portable = RuntimeError(f"{type(result).__name__}: {result}")
+        portable.source = getattr(result, "source", None)
+        return portable
+    return result
+
+async def _work(limits, jobs, results, options):
+    from core.plugin_loader import PluginLoader
+    from core.scheduler import Scheduler
+
+    http = AsyncHTTP(cache=ResponseCache() if options["cache"] else None, limits=limits)
+    plugins = PluginLoader().load(options["modules"], options["exclude"], options["category"])
+    scheduler = Scheduler(plugins, http, options["max_targets"], options["max_tasks"], options["per_target"])
+    buffer = []
+
+    def flush():
+        if buffer:
+            results.put(("items", list(buffer)))
+            buffer.clear()
+
+    def on_item(target, plugin, item):
+        buffer.append((target, plugin.name, plugin.source, plugin.produces, item))
+        if len(buffer) >= Config.WORKER_FLUSH:
+            flush()
+
+    def on_target(target, res):
+        flush()
+        results.put(("target", target, [_portable(r) for r in res]))
+
+    async def targets():
+        while (target := await asyncio.to_thread(jobs.get)) is not None:
+            yield target
+
+    await http.start()
+    try:
+        await scheduler.run_many(targets(), on_target, on_item=on_item)
+    finally:
+        await http.close()
+
+def _worker_main(index, config, limits, jobs, results, options):
+    for key, value in config.items():
+        setattr(Config, key, value)
+    setup_logger()
+    try:
+        asyncio.run(_work(limits, jobs, results, options))
+    except Exception as e:
+        logger.error(f"[Worker {index}] Falha: {e!r}")
+    finally:
+        results.put(("done", index, metrics.snapshot()))
+
+# Shards targets over N processes, each with its own event loop, AsyncHTTP
+# session and scheduler. Targets are handed out from one queue so a slow target
+# never stalls a fixed shard; findings and finished targets stream back to the
+# parent, and HTTP host budgets live in shared memory (SharedLimits). DNS
+# query caps are split evenly between the workers (SPLIT_RATES).
+class WorkerPool:
+    def __init__(self, workers, plugins, options):
+        self.workers = max(1, workers)
+        self.plugins = plugins
+        self.options = options
+        self.ctx = multiprocessing.get_context("spawn")
+        self.limits = SharedLimits(self.ctx)
+
+    async def run_many(self, targets, on_target=None, on_result=None, on_item=None):
+        jobs = self.ctx.Queue(maxsize=self.workers * self.options["max_targets"] * 2)
+        results = self.ctx.Queue()
+        procs = [
+            self.ctx.Process(
+                target=_worker_main,
+                args=(i, config_snapshot(self.workers), self.limits, jobs, results, self.options),
+                daemon=True
+            )
+            for i in range(self.workers)
+        ]
+        for proc in procs:
+            proc.start()
+
+        stop = threading.Event()
+
+        def put(job):
+            # Gives up once the pool is torn down instead of blocking on a full queue.
+            while not stop.is_set():
+                try:
+                    jobs.put(job, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def feed():
+            for target in targets:
+                if not put(target):
+                    return
+            for _ in procs:
+                put(None)
+
+        def receive():
+            try:
+                return results.get(timeout=1.0)
+            except queue.Empty:
+                return None
+
+        feeder = asyncio.create_task(asyncio.to_thread(feed))
+        refs, done = {}, 0
+        try:
+            while done < len(procs):
+                message = await asyncio.to_thread(receive)
+                if message is None:
+                    if not any(p.is_alive() for p in procs):
+                        logger.error("[Workers] Processos encerrados sem concluir")
+                        break
+                    continue
+
+                kind = message[0]
+                if kind == "items" and on_item:
+                    for target, name, source, produces, item in message[1]:
+                        ref = refs.get((name, source, produces))
+                        if ref is None:
+                            ref = refs[(name, source, produces)] = PluginRef(name, source, produces)
+                        on_item(target, ref, item)
+                elif kind == "target":
+                    if on_result:
+                        for res in message[2]:
+                            on_result(message[1], res)
+                    try:
+                        if on_target:
+                            on_target(message[1], message[2])
+                    except Exception as e:
+                        logger.error(f"[Workers] {message[1]}: falha ao gravar resultados: {e}")
+                elif kind == "done":
+                    metrics.merge(message[2])
+                    done += 1
+        finally:
+            stop.set()
+            for proc in procs:
+                proc.join(timeout=5)
+                if proc.is_alive():
+                    proc.terminate()
+            await feeder
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from pathlib import Path
+from core.base_module import BaseModule
+from core.config import Config
+from core.http import TokenBucket
+from core.logger import logger
+from core.metrics import metrics
+from core.resolver import get_resolver
+
+DEFAULT_WORDLIST = Path(__file__).parent / "wordlists" / "subdomains.txt"
+
+def iter_words(path):
+    # Streams the wordlist line by line, so memory stays flat whatever its size.
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        for line in handle:
+            word = line.strip().lower().strip(".")
+            if word and not word.startswith("#"):
+                yield word
+
+def permutations(name, words):
+    label, _, parent = name.partition(".")
+    for word in words:
+        yield f"{word}-{label}.{parent}"
+        yield f"{label}-{word}.{parent}"
+        yield f"{label}{word}.{parent}"
+        yield f"{word}.{name}"
+
+    base = label.rstrip("0123456789")
+    if base != label:
+        for n in range(10):
+            yield f"{base}{n}.{parent}"
+
+def valid(names):
+    for name in names:
+        if len(name) <= 253 and all(0 < len(label) <= 63 for label in name.split(".")):
+            yield name
+
+class SubdomainBrute(BaseModule):
+    # One query budget per event loop, shared by every wordlist and permutation run.
+    _paces = {}
+
+    def __init__(self):
+        self.name = "Subdomain Brute"
+        self.description = "Wordlist and permutation subdomain brute-force"
+        self.category = "active"
+        self.consumes = "subdomains"
+        self.produces = "subdomains"
+        self.source = "bruteforce"
+
+        self.wordlist = Config.BRUTE_WORDLIST or DEFAULT_WORDLIST
+
+    def _pace(self):
+        loop = asyncio.get_running_loop()
+        pace = self._paces.get(loop)
+        if pace is None:
+            self._paces.clear()
+            pace = self._paces[loop] = TokenBucket(Config.BRUTE_QPS, int(Config.BRUTE_QPS))
+        return pace
+
+    async def process(self, item, target: str, http_client):
+        # The seed (the target itself) gets the wordlist; names found by other
+        # sources get permutations. Both are generated lazily and only names
+        # that resolve outside a wildcard are yielded.
+        if not Config.BRUTE:
+            return
+        resolver = get_resolver()
+        if item == target:
+            candidates = (f"{word}.{target}" for word in iter_words(self.wordlist))
+            kind = "wordlist"
+        elif Config.BRUTE_PERMUTATIONS and item.endswith("." + target) and not item.startswith("*"):
+            candidates = permutations(item, Config.PERMUTATION_WORDS)
+            kind = "permutation"
+            parent = item.partition(".")[2]
+            if Config.WILDCARD_FILTER and await resolver.wildcard(parent):
+                # Siblings under a wildcard zone all resolve to it; only try
+                # names below the item itself.
+                candidates = (name for name in candidates if name.endswith("." + item))
+        else:
+            return
+
+        tried = metrics.counter("recon_brute_candidates_total", kind=kind)
+        hits = metrics.counter("recon_brute_found_total", kind=kind)
+        started, found = time.perf_counter(), 0
+
+        async for name, _, ips in resolver.resolve_many(valid(candidates), pace=self._pace()):
+            tried.inc()
+            if not ips:
+                continue
+            if Config.WILDCARD_FILTER and await resolver.is_wildcard(name, ips, scope=target):
+                continue
+            hits.inc()
+            found += 1
+            yield name
+
+        if kind == "wordlist":
+            logger.info(f"[{self.name}] {target}: {found} subdomínios via wordlist em {time.perf_counter() - started:.1f}s")
+
+    async def run(self, target: str, http_client) -> dict:
+        logger.info(f"[{self.name}] Brute-force em: {target}")
+        found = [name async for name in self.process(target, target, http_client)]
+
+        return {
+            "source": self.source,
+            "type": self.produces,
+            "data": sorted(found)
+        }
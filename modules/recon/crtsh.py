@@ -1,5 +1,7 @@
-import json
-from core.base_module import BaseModule
+from core.base_module import BaseModule, Incomplete
+from core.config import Config
+from core.domains import DomainSet, in_scope, normalize
+from core.jsonstream import iter_json_array
 from core.logger import logger
 
 class CRTSHRecon(BaseModule):
@@ -7,36 +9,35 @@ class CRTSHRecon(BaseModule):
         self.name = "CRT.sh"
         self.description = "Certificate Transparency Recon"
         self.category = "recon"
-
-    async def run(self, target: str, http_client) -> dict:
-        url = f"https://crt.sh/?q=%.{target}&output=json"
+        self.produces = "subdomains"
+        self.source = "crt.sh"
+
+    async def iter_domains(self, target: str, http_client, seen: DomainSet):
+        # Decodes crt.sh entries as the body streams in and yields each new domain once.
+        url = f"{Config.CRTSH_URL}?q=%.{target}&output=json"
+        chunks = http_client.stream(url, timeout=25)
+
+        async for entry in iter_json_array(chunks):
+            name_value = entry.get("name_value", "") if isinstance(entry, dict) else ""
+            for domain in name_value.split("\n"):
+                domain = normalize(domain)
+                if domain and in_scope(domain, target) and seen.add(domain):
+                    yield domain
+
+    async def run(self, target: str, http_client):
         logger.info(f"[{self.name}] Buscando CT logs para: {target}")
 
-        found_domains = set()
+        found_domains = DomainSet()
 
         try:
-            text = await http_client.get(url, timeout=25)
-
-            if not text or "<html" in text.lower():
-                logger.warning(f"[{self.name}] JSON indisponível (fallback bloqueado).")
-                return {"source": "crt.sh", "type": "subdomains", "data": []}
-
-            data = json.loads(text)
-
-            for entry in data:
-                name_value = entry.get("name_value", "")
-                for domain in name_value.split("\n"):
-                    domain = domain.lower().strip().replace("*.", "")
-                    if domain.endswith(target):
-                        found_domains.add(domain)
+            async for domain in self.iter_domains(target, http_client, found_domains):
+                yield domain
 
             logger.info(f"[{self.name}] Subdomínios encontrados: {len(found_domains)}")
 
+        except ValueError as e:
+            logger.warning(f"[{self.name}] JSON indisponível ou truncado: {e}")
+            raise Incomplete("truncated" if found_domains else "error")
         except Exception as e:
             logger.error(f"[{self.name}] Erro: {e}")
-
-        return {
-            "source": "crt.sh",
-            "type": "subdomains",
-            "data": sorted(found_domains)
-        }
+            raise Incomplete("truncated" if found_domains else "error")
@@ -0,0 +1,60 @@
+import asyncio
+from core.base_module import BaseModule
+from core.config import Config
+from core.fingerprint import fingerprint, get_park
+from core.logger import logger
+from core.metrics import metrics
+
+class ServiceFingerprint(BaseModule):
+    # One probe budget per event loop, shared by every target running in it.
+    _budgets = {}
+
+    def __init__(self):
+        self.name = "Service Fingerprint"
+        self.description = "Banner grabbing and HTTP/TLS/SSH fingerprinting of open ports"
+        self.category = "active"
+        self.consumes = "open_ports"
+        self.produces = "services"
+        self.source = "fingerprint"
+
+    def _budget(self):
+        loop = asyncio.get_running_loop()
+        budget = self._budgets.get(loop)
+        if budget is None:
+            self._budgets.clear()
+            budget = self._budgets[loop] = asyncio.Semaphore(Config.FP_CONCURRENCY)
+        return budget
+
+    async def probe(self, host, port):
+        # Claim the socket the scanner left open; reconnect only when it is gone.
+        sock = get_park().claim(host, port)
+        metrics.inc("recon_fingerprint_total", reused=str(sock is not None).lower())
+        async with self._budget():
+            try:
+                return await asyncio.wait_for(fingerprint(host, port, sock), Config.FP_TIMEOUT)
+            except asyncio.TimeoutError:
+                metrics.inc("recon_fingerprint_timeouts_total")
+                return None
+
+    async def process(self, item, target: str, http_client) -> list:
+        if not Config.FINGERPRINT:
+            return []
+        host, _, port = item.rpartition(":")
+        found = await self.probe(host, int(port))
+        if not found:
+            return []
+        service, detail = found
+        return [f"{item} {service} {detail}".rstrip()]
+
+    async def run(self, target: str, http_client) -> dict:
+        logger.info(f"[{self.name}] Fingerprinting: {target}")
+        services = []
+        for item in target.split(","):
+            if ":" in item:
+                services.extend(await self.process(item.strip(), target, http_client))
+
+        return {
+            "source": self.source,
+            "type": self.produces,
+            "data": services
+        }
@@ -1,4 +1,6 @@
-from core.base_module import BaseModule
+from core.base_module import BaseModule, Incomplete
+from core.config import Config
+from core.domains import DomainSet, in_scope, normalize, public_suffixes
 from core.logger import logger
 
 class HackerTargetRecon(BaseModule):
@@ -6,41 +8,46 @@ class HackerTargetRecon(BaseModule):
         self.name = "HackerTarget"
         self.description = "Passive Subdomain Recon (HackerTarget)"
         self.category = "recon"
+        self.produces = "subdomains"
+        self.source = "hackertarget"
 
     def extract_root_domain(self, domain):
-        parts = domain.lower().split(".")
-        if len(parts) >= 2:
-            return ".".join(parts[-2:])
-        return domain
+        # Registrable domain per the public suffix list (example.co.uk, not co.uk).
+        domain = domain.lower()
+        return public_suffixes().registrable(domain) or domain
 
     async def run(self, target: str, http_client) -> dict:
-        url = f"https://api.hackertarget.com/hostsearch/?q={target}"
+        url = f"{Config.HACKERTARGET_URL}?q={target}"
         logger.info(f"[{self.name}] Consultando HackerTarget API")
 
-        found = set()
+        found = DomainSet()
 
         try:
             text = await http_client.get(url, timeout=20)
 
             if not text or "error" in text.lower():
                 logger.warning(f"[{self.name}] API retornou vazio")
-                return {"source": "hackertarget", "type": "subdomains", "data": []}
+                raise Incomplete("error")
 
             root_domain = self.extract_root_domain(target)
 
             for line in text.splitlines():
-                host = line.split(",")[0].strip().lower()
+                host = normalize(line.split(",")[0])
 
-                if host.endswith(root_domain):
+                if host and in_scope(host, root_domain):
                     found.add(host)
 
             logger.info(f"[{self.name}] Subdomínios encontrados: {len(found)}")
 
+        except Incomplete:
+            raise
         except Exception as e:
+            # An empty answer here says nothing about what is gone.
             logger.error(f"[{self.name}] Erro: {e}")
+            raise Incomplete("error")
 
         return {
-            "source": "hackertarget",
-            "type": "subdomains",
+            "source": self.source,
+            "type": self.produces,
             "data": sorted(found)
         }
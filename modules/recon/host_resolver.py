@@ -0,0 +1,31 @@
+from core.base_module import BaseModule
+from core.config import Config
+from core.logger import logger
+from core.resolver import get_resolver
+
+class HostResolver(BaseModule):
+    def __init__(self):
+        self.name = "Host Resolver"
+        self.description = "Resolves discovered subdomains to IPv4 addresses"
+        self.category = "infra"
+        self.consumes = "subdomains"
+        self.produces = "ips"
+        self.source = "host_resolver"
+
+    async def process(self, item, target: str, http_client) -> list:
+        resolver = get_resolver()
+        ips = await resolver.resolve(item, "A")
+        # Names that only resolve through a wildcard are junk; keep them away from the scanner.
+        if Config.WILDCARD_FILTER and await resolver.is_wildcard(item, ips, scope=target):
+            return []
+        return ips
+
+    async def run(self, target: str, http_client) -> dict:
+        logger.info(f"[{self.name}] Resolvendo host: {target}")
+        ips = await self.process(target, target, http_client)
+
+        return {
+            "source": self.source,
+            "type": self.produces,
+            "data": sorted(ips)
+        }
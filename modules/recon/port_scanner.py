@@ -1,38 +1,256 @@
 import asyncio
+import errno
+import ipaddress
+import socket
+import struct
+import sys
+import time
+from core.adaptive import AdaptiveLimit
 from core.base_module import BaseModule
+from core.config import Config
+from core.fingerprint import get_park
 from core.logger import logger
+from core.metrics import metrics
+from core.ports import parse_ports, iter_hosts
+
+IN_PROGRESS = (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN)
+LINGER_RST = struct.pack("ii", 1, 0)
 
 class PortScanner(BaseModule):
+    # One probe budget per event loop, shared by every sweep running in it.
+    _budgets = {}
+    TICK = 0.05
+
     def __init__(self):
         self.name = "Port Scanner"
-        self.description = "Async TCP Port Scan (Top 100)"
+        self.description = "Async TCP Port Scan"
         self.category = "active"
+        self.consumes = "ips"
+        self.produces = "open_ports"
+        self.source = "port_scan"
+
+        self.ports = parse_ports(Config.SCAN_PORTS)
+        self.timeout = Config.SCAN_TIMEOUT
+        self.engine = Config.SCAN_ENGINE
+        if self.engine == "auto":
+            self.engine = "stream" if sys.platform == "win32" else "socket"
+        # Open sockets are left for the fingerprint stage instead of reset.
+        self.park = Config.FINGERPRINT and self.engine == "socket"
+        self.probes = 0
+        self.started = None
+        self.finished = None
+
+    def _budget(self):
+        loop = asyncio.get_running_loop()
+        budget = self._budgets.get(loop)
+        if budget is None:
+            self._budgets.clear()
+            budget = self._budgets[loop] = AdaptiveLimit("tcp", Config.SCAN_CONCURRENCY, *Config.SCAN_ADAPTIVE)
+        return budget
 
-        self.ports = [
-            21,22,23,25,53,80,110,139,143,443,
-            445,3389,3306,5432,8080,8443,5900
-        ]
+    def _observe(self, outcome, elapsed):
+        metrics.inc("recon_scan_probes_total", result=outcome)
+        metrics.observe("recon_scan_probe_seconds", elapsed)
+        # A handshake or RST is an answer; only silence means congestion.
+        if outcome in ("open", "closed"):
+            self._budget().record("ok", elapsed)
+        elif outcome == "timeout":
+            self._budget().record("timeout")
 
     async def scan_port(self, host, port):
+        started = time.perf_counter()
         try:
             reader, writer = await asyncio.wait_for(
                 asyncio.open_connection(host, port),
-                timeout=3.0
+                timeout=self.timeout
             )
             writer.close()
             await writer.wait_closed()
+            outcome = "open"
             return port
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            return None
         except:
+            outcome = "closed"
             return None
+        finally:
+            self._observe(outcome, time.perf_counter() - started)
+
+    async def sweep(self, hosts, ports=None):
+        ports = ports or self.ports
+        budget = self._budget()
+        found = []
+        if self.started is None:
+            self.started = time.monotonic()
+
+        sweep = self._sweep_socket if self.engine == "socket" else self._sweep_stream
+        try:
+            await sweep(hosts, ports, budget, found)
+        finally:
+            self.finished = time.monotonic()
+
+        return sorted(found)
+
+    async def _sweep_stream(self, hosts, ports, budget, found):
+        # (host, port) pairs are generated lazily and only become tasks once the
+        # global budget has a free slot, so live coroutines never exceed the budget.
+        tasks = set()
+
+        async def probe(host, port):
+            try:
+                if await self.scan_port(host, port):
+                    found.append((host, port))
+            finally:
+                budget.release()
+
+        try:
+            for host in hosts:
+                for port in ports:
+                    await budget.acquire()
+                    task = asyncio.ensure_future(probe(host, port))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    self.probes += 1
+
+            if tasks:
+                await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def _address(self, host, cache):
+        # IP literals go straight to connect(); names are resolved once per sweep
+        # so connect_ex never blocks on a lookup.
+        if host not in cache:
+            try:
+                ip = ipaddress.ip_address(host)
+                cache[host] = (socket.AF_INET6 if ip.version == 6 else socket.AF_INET, host)
+            except ValueError:
+                loop = asyncio.get_running_loop()
+                try:
+                    info = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+                    cache[host] = (info[0][0], info[0][4][0])
+                except OSError:
+                    cache[host] = None
+        return cache[host]
+
+    async def _sweep_socket(self, hosts, ports, budget, found):
+        # Raw non-blocking connect(): one socket and one writer callback per
+        # probe, no task, stream or protocol objects. Timeouts are batched into
+        # TICK-wide buckets that share one timer.
+        loop = asyncio.get_running_loop()
+        tick = self.TICK
+        pending = {}
+        buckets = {}
+        addresses = {}
+        park = get_park() if self.park else None
+        done = loop.create_future()
+        feeding = True
+
+        def finish(fd, sock, outcome):
+            entry = pending.get(fd)
+            if entry is None or entry[0] is not sock:
+                return
+            del pending[fd]
+            _, host, port, started = entry
+            loop.remove_writer(fd)
+            if outcome == "open":
+                found.append((host, port))
+                if park is not None:
+                    park.put(host, port, sock)
+                    sock = None
+                else:
+                    # RST instead of FIN: no TIME_WAIT pile-up on big sweeps.
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RST)
+            if sock is not None:
+                sock.close()
+            budget.release()
+            self._observe(outcome, time.perf_counter() - started)
+            if not feeding and not pending and not done.done():
+                done.set_result(None)
+
+        def on_writable(fd, sock):
+            err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            finish(fd, sock, "open" if err == 0 else "closed")
+
+        def expire(slot):
+            for fd, sock in buckets.pop(slot, ()):
+                finish(fd, sock, "timeout")
+
+        def settle(host, port, started, outcome):
+            budget.release()
+            if outcome == "open":
+                found.append((host, port))
+            self._observe(outcome, time.perf_counter() - started)
+
+        try:
+            for host in hosts:
+                address = await self._address(host, addresses)
+                for port in ports:
+                    await budget.acquire()
+                    self.probes += 1
+                    started = time.perf_counter()
+                    if address is None:
+                        settle(host, port, started, "closed")
+                        continue
+
+                    family, ip = address
+                    try:
+                        sock = socket.socket(family, socket.SOCK_STREAM)
+                    except OSError as e:
+                        logger.debug("[%s] socket(): %s", self.name, e)
+                        settle(host, port, started, "error")
+                        continue
+                    sock.setblocking(False)
+                    err = sock.connect_ex((ip, port))
+                    if err not in IN_PROGRESS:
+                        sock.close()
+                        settle(host, port, started, "open" if err == 0 else "closed")
+                        continue
+
+                    fd = sock.fileno()
+                    pending[fd] = (sock, host, port, started)
+                    loop.add_writer(fd, on_writable, fd, sock)
+                    slot = int((loop.time() + self.timeout) / tick) + 1
+                    bucket = buckets.get(slot)
+                    if bucket is None:
+                        bucket = buckets[slot] = []
+                        loop.call_at(slot * tick, expire, slot)
+                    bucket.append((fd, sock))
+
+            feeding = False
+            if pending:
+                await done
+        except asyncio.CancelledError:
+            for fd, (sock, *_rest) in list(pending.items()):
+                finish(fd, sock, "cancelled")
+            raise
+
+    @property
+    def rate(self):
+        if self.started is None or self.finished is None or self.finished <= self.started:
+            return 0.0
+        return self.probes / (self.finished - self.started)
+
+    async def process(self, item, target: str, http_client) -> list:
+        found = await self.sweep([item])
+        logger.debug("[%s] %s: %d probes (%.0f probes/s)", self.name, item, self.probes, self.rate)
+        return [f"{host}:{port}" for host, port in found]
 
     async def run(self, target: str, http_client) -> dict:
-        logger.info(f"[{self.name}] Scanning portas TCP em {target}")
+        logger.info(f"[{self.name}] Scanning {len(self.ports)} portas TCP em {target}")
 
-        tasks = [self.scan_port(target, p) for p in self.ports]
-        results = await asyncio.gather(*tasks)
+        single = "," not in target and "/" not in target
+        start, before = time.monotonic(), self.probes
+        found = await self.sweep(iter_hosts(target))
+        elapsed = time.monotonic() - start
+        probes = self.probes - before
 
-        open_ports = sorted([p for p in results if p])
+        open_ports = [p for _, p in found] if single else [f"{h}:{p}" for h, p in found]
 
+        logger.info(f"[{self.name}] {probes} probes em {elapsed:.2f}s ({probes / max(elapsed, 1e-9):.0f} probes/s)")
         if open_ports:
             logger.info(f"[{self.name}] Portas abertas detectadas: {open_ports}")
         else:
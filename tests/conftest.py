@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The repo root is a flat tree of packages (core, modules), not an installed one.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
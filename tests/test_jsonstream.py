@@ -0,0 +1,32 @@
+import asyncio
+import pytest
+from core.jsonstream import iter_json_array
+
+def decode(*chunks):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [item async for item in iter_json_array(source())]
+    return asyncio.run(collect())
+
+@pytest.mark.parametrize("chunks, expected", [
+    ((b'[{"a":1},', b'{"b":2}]'), [{"a": 1}, {"b": 2}]),
+    ((b"[1,2.", b"5]"), [1, 2.5]),
+    ((b"[1e", b"3]"), [1000.0]),
+    ((b"[12", b"34, -", b"5]"), [1234, -5]),
+    ((b'["ab', b'c", tr', b"ue]"), ["abc", True]),
+    ((b"[1.5e-", b"2 ", b" ]"), [0.015]),
+    ((b'["\xc3', b'\xa9"]'), ["\u00e9"]),
+])
+def test_values_split_across_chunks(chunks, expected):
+    assert decode(*chunks) == expected
+    # One byte at a time is the worst case of every split.
+    joined = b"".join(chunks)
+    assert decode(*(joined[i:i + 1] for i in range(len(joined)))) == expected
+
+@pytest.mark.parametrize("chunks", [(b'[{"a":1},',), (b"",), (b"[1, 2",), (b"[1x]",)])
+def test_truncated_or_invalid_bodies_raise(chunks):
+    with pytest.raises(ValueError):
+        decode(*chunks)
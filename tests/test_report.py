@@ -0,0 +1,21 @@
+import json
+import re
+from core.report import ReportGenerator
+
+HOSTILE = 'v=spf1 <!--<script> x</script> & "quoted"'
+
+def test_json_mode_keeps_script_markup_out_of_the_data_block(tmp_path):
+    report = ReportGenerator(tmp_path, mode="json", compress=False)
+    data = {"dns_resolver": [f"TXT: {HOSTILE}", "IP: 1.2.3.4"]}
+    page = open(report.generate("example.com", data), encoding="utf-8").read()
+
+    # The block ends at the first "</script>", which must be its own.
+    block = re.search(r'<script type="application/json" id="data-0">(.*?)</script>', page, re.S).group(1)
+    assert "<" not in block and ">" not in block and "&" not in block
+    assert json.loads(block) == data["dns_resolver"]
+
+def test_target_is_escaped(tmp_path):
+    report = ReportGenerator(tmp_path, mode="html")
+    page = open(report.generate("<b>x", {}), encoding="utf-8").read()
+    assert "<b>x" not in page
+    assert "RECON// &lt;b&gt;x" in page
@@ -0,0 +1,27 @@
+from core.store import ResultStore
+
+def result(source, data, **extra):
+    return {"source": source, "type": "subdomains", "data": data, **extra}
+
+def test_partial_module_run_after_full_run(tmp_path):
+    store = ResultStore(tmp_path / "recon.sqlite")
+    full = [result("crt.sh", ["a.example.com"]), result("hackertarget", ["b.example.com"])]
+    store.record("example.com", full)
+
+    # --modules crtsh: hackertarget did not run, so nothing of it is gone.
+    run = store.record("example.com", [result("crt.sh", ["a.example.com", "c.example.com"])])
+    assert store.diff("example.com", run) == {"crt.sh [+]": ["c.example.com"]}
+
+    # The next full run compares hackertarget with the last run that had it.
+    run = store.record("example.com", full)
+    assert store.diff("example.com", run) == {"crt.sh [-]": ["c.example.com"]}
+
+def test_incomplete_source_reports_no_gone_assets(tmp_path):
+    store = ResultStore(tmp_path / "recon.sqlite")
+    store.record("example.com", [result("crt.sh", ["a.example.com", "b.example.com"])])
+    run = store.record("example.com", [result("crt.sh", ["c.example.com"], incomplete="timeout")])
+    assert store.diff("example.com", run, {"crt.sh"}) == {"crt.sh [+]": ["c.example.com"]}
+
+    # The partial run is not a baseline: the next run still compares with the first.
+    run = store.record("example.com", [result("crt.sh", ["a.example.com", "b.example.com"])])
+    assert store.diff("example.com", run) == {}